@@ -3,7 +3,10 @@
 # ======================================================
 
 import os
+import shutil
 import sys
+
+import numpy as np
 import pandas as pd
 
 from sklearn.model_selection import train_test_split
@@ -24,10 +27,18 @@ from src.components.model_trainer import ModelTrainer
 @dataclass
 class DataIngestionConfig:
 
+    source_data_path: str = os.path.join('notebook', 'data', "stud.csv")
+
     train_data_path: str = os.path.join('artifacts', "train.csv")
     test_data_path: str = os.path.join('artifacts', "test.csv")
     raw_data_path: str = os.path.join('artifacts', "data.csv")
 
+    test_size: float = 0.2
+    random_state: int = 42
+
+    # Rows read at a time by the streaming split
+    chunk_rows: int = 50_000
+
 
 
 # ======================================================
@@ -45,7 +56,7 @@ class DataIngestion:
 
         try:
             # Step 1: Read dataset
-            df = pd.read_csv('notebook/data/stud.csv')
+            df = pd.read_csv(self.ingestion_config.source_data_path)
             logging.info("Dataset loaded successfully")
 
             # Step 2: Create artifacts folder
@@ -60,8 +71,8 @@ class DataIngestion:
             # Step 4: Train-Test Split
             train_set, test_set = train_test_split(
                 df,
-                test_size=0.2,
-                random_state=42
+                test_size=self.ingestion_config.test_size,
+                random_state=self.ingestion_config.random_state
             )
 
             # Step 5: Save split datasets
@@ -80,6 +91,50 @@ class DataIngestion:
 
 
 
+    # --------------------------------------------------
+    # Streaming variant for the out-of-core path: the
+    # source is read chunk by chunk and each row goes to
+    # test with probability test_size (seeded), so memory
+    # stays at one chunk. The split is random per row, not
+    # the exact train_test_split partition.
+    # --------------------------------------------------
+    def initiate_streaming_data_ingestion(self, chunk_rows=None):
+
+        logging.info("Entered streaming Data Ingestion component")
+
+        try:
+            config = self.ingestion_config
+            chunk_rows = chunk_rows or config.chunk_rows
+            rng = np.random.default_rng(config.random_state)
+
+            os.makedirs(os.path.dirname(config.train_data_path), exist_ok=True)
+
+            # Raw copy without parsing
+            shutil.copyfile(config.source_data_path, config.raw_data_path)
+
+            n_train = n_test = 0
+            for position, chunk in enumerate(
+                pd.read_csv(config.source_data_path, chunksize=chunk_rows)
+            ):
+                is_test = rng.random(len(chunk)) < config.test_size
+
+                # First chunk (re)creates both files with a header
+                mode, header = ("w", True) if position == 0 else ("a", False)
+                chunk[~is_test].to_csv(config.train_data_path, mode=mode, header=header, index=False)
+                chunk[is_test].to_csv(config.test_data_path, mode=mode, header=header, index=False)
+
+                n_test += int(is_test.sum())
+                n_train += len(chunk) - int(is_test.sum())
+
+            logging.info(f"Streaming data ingestion completed: {n_train} train, {n_test} test rows")
+
+            return config.train_data_path, config.test_data_path
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+
 # ======================================================
 # Pipeline Runner (Entry Point)
 # ======================================================
@@ -99,7 +154,7 @@ if __name__ == "__main__":
         # Step 2: Data Transformation
         # --------------------------------------
         transformation_obj = DataTransformation()
-        train_arr, test_arr, _ = transformation_obj.initiate_data_transformation(
+        train_arr, test_arr, preprocessor_path = transformation_obj.initiate_data_transformation(
             train_path, test_path
         )
 
@@ -109,7 +164,7 @@ if __name__ == "__main__":
         # --------------------------------------
         model_trainer = ModelTrainer()
         r2_score_value = model_trainer.initiate_model_trainer(
-            train_arr, test_arr
+            train_arr, test_arr, preprocessor_path
         )
 
         print(f"\nFinal R2 Score: {r2_score_value:.4f}")
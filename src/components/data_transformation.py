@@ -4,6 +4,7 @@
 
 import os                      # for path handling
 import sys                     # for traceback info in exceptions
+from collections import Counter
 from dataclasses import dataclass
 
 import numpy as np
@@ -16,11 +17,42 @@ from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
 # custom project modules
+from src.components.drift_monitor import (
+    PREDICTION_SKETCH_NAME,
+    CategoricalSketch,
+    DriftMonitor,
+    HistogramSketch,
+)
 from src.exception import CustomException
 from src.logger import logging
 from src.utils import save_object   # function to save pickle files
 
 
+# =========================================================
+# Feature Schema
+# Shared with the inference side (prediction cache keys,
+# full-table precompute), so kept at module level
+# =========================================================
+
+# Numerical columns → scaling required
+NUMERICAL_COLUMNS = [
+    "writing score",
+    "reading score"
+]
+
+# Categorical columns → encoding required
+CATEGORICAL_COLUMNS = [
+    "gender",
+    "race/ethnicity",
+    "parental level of education",
+    "lunch",
+    "test preparation course"
+]
+
+# Column the models predict
+TARGET_COLUMN = "math score"
+
+
 # =========================================================
 # Configuration Class
 # Purpose:
@@ -37,6 +69,54 @@ class DataTransformationConfig:
         "preprocessor.pkl"
     )
 
+    # Reference input/target sketches for drift monitoring
+    reference_sketch_file_path: str = os.path.join(
+        "artifacts",
+        "reference_sketch.pkl"
+    )
+
+    # Rows per chunk in out-of-core mode
+    chunk_rows: int = 50_000
+
+
+# =========================================================
+# Streaming statistics helpers (out-of-core mode)
+# Exact value counts are kept per column: the score
+# columns only take integer values 0-100, so memory is
+# bounded by the value domain, not by the row count.
+# =========================================================
+
+def _median_from_counts(counts):
+
+    values = np.array(sorted(counts), dtype=np.float64)
+    cumulative = np.cumsum([counts[value] for value in sorted(counts)])
+    total = cumulative[-1]
+
+    # Same definition as np.median: mean of the two middle values
+    low = values[np.searchsorted(cumulative, (total - 1) // 2, side="right")]
+    high = values[np.searchsorted(cumulative, total // 2, side="right")]
+
+    return (low + high) / 2
+
+
+def _most_frequent_from_counts(counts):
+
+    # Ties → smallest value, as SimpleImputer(strategy="most_frequent")
+    best = max(counts.values())
+    return min(value for value, count in counts.items() if count == best)
+
+
+def _moments_after_imputation(counts, n_missing, fill_value):
+
+    values = np.array(list(counts) + [fill_value], dtype=np.float64)
+    weights = np.array(list(counts.values()) + [n_missing], dtype=np.float64)
+
+    n_samples = weights.sum()
+    mean = np.sum(weights * values) / n_samples
+    var = np.sum(weights * (values - mean) ** 2) / n_samples
+
+    return mean, var, int(n_samples)
+
 
 # =========================================================
 # Data Transformation Component
@@ -68,21 +148,8 @@ class DataTransformation:
             # -------------------------------------------------
             # Separate column types
             # -------------------------------------------------
-
-            # Numerical columns → scaling required
-            numerical_columns = [
-                "writing score",
-                "reading score"
-            ]
-
-            # Categorical columns → encoding required
-            categorical_columns = [
-                "gender",
-                "race/ethnicity",
-                "parental level of education",
-                "lunch",
-                "test preparation course"
-            ]
+            numerical_columns = NUMERICAL_COLUMNS
+            categorical_columns = CATEGORICAL_COLUMNS
 
 
             # -------------------------------------------------
@@ -133,6 +200,142 @@ class DataTransformation:
             raise CustomException(e, sys)
 
 
+    # =====================================================
+    # Chunk generators (out-of-core mode)
+    # =====================================================
+    @staticmethod
+    def iter_chunks(file_path, chunk_rows):
+        yield from pd.read_csv(file_path, chunksize=chunk_rows)
+
+
+    @staticmethod
+    def iter_transformed_chunks(file_path, preprocessing_obj, chunk_rows):
+
+        for chunk in DataTransformation.iter_chunks(file_path, chunk_rows):
+            features = preprocessing_obj.transform(chunk.drop(columns=[TARGET_COLUMN]))
+
+            if hasattr(features, "toarray"):
+                features = features.toarray()
+
+            yield np.asarray(features, dtype=np.float64), chunk[TARGET_COLUMN].to_numpy(dtype=np.float64)
+
+
+    # =====================================================
+    # Out-of-core Transformation
+    # Flow:
+    #   one streaming pass over train.csv collects
+    #     - value counts + missing counts per column
+    #     - reference drift sketches
+    #   → imputer / scaler / encoder statistics are derived
+    #     from those counts (same values fit() would learn)
+    #   → save preprocessor + reference sketch
+    # =====================================================
+    def initiate_out_of_core_transformation(self, train_path, chunk_rows=None):
+
+        try:
+            chunk_rows = chunk_rows or self.data_transformation_config.chunk_rows
+
+            logging.info(f"Streaming {train_path} in chunks of {chunk_rows} rows")
+
+
+            # -------------------------------------------------
+            # Step 1: Single streaming pass
+            # -------------------------------------------------
+            value_counts = {column: Counter() for column in NUMERICAL_COLUMNS + CATEGORICAL_COLUMNS}
+            missing_counts = {column: 0 for column in value_counts}
+            histograms = {column: HistogramSketch() for column in NUMERICAL_COLUMNS}
+            histograms[PREDICTION_SKETCH_NAME] = HistogramSketch()
+            n_rows = 0
+
+            for chunk in self.iter_chunks(train_path, chunk_rows):
+                for column in value_counts:
+                    value_counts[column].update(chunk[column].value_counts().to_dict())
+                    missing_counts[column] += int(chunk[column].isna().sum())
+
+                for column in NUMERICAL_COLUMNS:
+                    histograms[column].update(chunk[column].to_numpy())
+                # Placeholder until ModelTrainer.save_reference_predictions
+                histograms[PREDICTION_SKETCH_NAME].update(chunk[TARGET_COLUMN].to_numpy())
+
+                n_rows += len(chunk)
+
+            logging.info(f"Collected statistics over {n_rows} rows")
+
+
+            # -------------------------------------------------
+            # Step 2: Build the usual preprocessor with fixed
+            # categories, fit it on one chunk so every fitted
+            # attribute exists, then overwrite the statistics
+            # with the full-data values
+            # -------------------------------------------------
+            categories = [sorted(value_counts[column]) for column in CATEGORICAL_COLUMNS]
+
+            preprocessing_obj = self.get_data_transformer_object()
+            preprocessing_obj.set_params(cat_pipeline__one_hot_encoder__categories=categories)
+
+            first_chunk = next(self.iter_chunks(train_path, chunk_rows))
+            preprocessing_obj.fit(first_chunk.drop(columns=[TARGET_COLUMN]))
+
+            num_pipeline = preprocessing_obj.named_transformers_["num_pipeline"]
+            cat_pipeline = preprocessing_obj.named_transformers_["cat_pipeline"]
+
+            medians = [_median_from_counts(value_counts[column]) for column in NUMERICAL_COLUMNS]
+            moments = [
+                _moments_after_imputation(value_counts[column], missing_counts[column], median)
+                for column, median in zip(NUMERICAL_COLUMNS, medians)
+            ]
+
+            num_pipeline.named_steps["imputer"].statistics_ = np.array(medians)
+
+            scaler = num_pipeline.named_steps["scaler"]
+            scaler.mean_ = np.array([mean for mean, _, _ in moments])
+            scaler.var_ = np.array([var for _, var, _ in moments])
+            scaler.scale_ = np.where(scaler.var_ > 0, np.sqrt(scaler.var_), 1.0)
+            scaler.n_samples_seen_ = np.int64(n_rows)
+
+            cat_pipeline.named_steps["imputer"].statistics_ = np.array(
+                [_most_frequent_from_counts(value_counts[column]) for column in CATEGORICAL_COLUMNS],
+                dtype=object
+            )
+
+
+            # -------------------------------------------------
+            # Step 3: Save preprocessing object
+            # -------------------------------------------------
+            save_object(
+                file_path=self.data_transformation_config.preprocessor_obj_file_path,
+                obj=preprocessing_obj
+            )
+
+
+            # -------------------------------------------------
+            # Step 4: Save reference sketches from the same pass
+            # -------------------------------------------------
+            sketches = {}
+            for column, levels in zip(CATEGORICAL_COLUMNS, categories):
+                sketch = CategoricalSketch(levels)
+                sketch.counts[:-1] = [value_counts[column][level] for level in levels]
+                sketch.counts[-1] = missing_counts[column]
+                sketches[column] = sketch
+            sketches.update(histograms)
+
+            reference_monitor = DriftMonitor(sketches)
+            reference_monitor.n_rows = n_rows
+
+            save_object(
+                file_path=self.data_transformation_config.reference_sketch_file_path,
+                obj=reference_monitor
+            )
+
+            logging.info("Out-of-core preprocessor and reference sketch saved")
+
+            return preprocessing_obj, self.data_transformation_config.preprocessor_obj_file_path
+
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
     # =====================================================
     # Main Transformation Function
     # Flow:
@@ -160,7 +363,7 @@ class DataTransformation:
             # -------------------------------------------------
             # Step 3: Define target column
             # -------------------------------------------------
-            target_column_name = "math score"
+            target_column_name = TARGET_COLUMN
 
 
             # -------------------------------------------------
@@ -221,7 +424,26 @@ class DataTransformation:
 
 
             # -------------------------------------------------
-            # Step 7: Return processed arrays
+            # Step 7: Save reference sketches of training data
+            # Live inference traffic is compared against these.
+            # The target fills the prediction sketch until
+            # ModelTrainer replaces it with model predictions
+            # -------------------------------------------------
+            reference_monitor = DriftMonitor.from_frame(
+                train_df,
+                categorical_columns=CATEGORICAL_COLUMNS,
+                numerical_columns=NUMERICAL_COLUMNS,
+                prediction_column=target_column_name
+            )
+
+            save_object(
+                file_path=self.data_transformation_config.reference_sketch_file_path,
+                obj=reference_monitor
+            )
+
+
+            # -------------------------------------------------
+            # Step 8: Return processed arrays
             # -------------------------------------------------
             return (
                 train_arr,
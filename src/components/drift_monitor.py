@@ -0,0 +1,305 @@
+# ======================================================
+# drift_monitor.py
+# Constant-memory sketches of model inputs / predictions
+#
+#   CategoricalSketch -> counts per known level (+ "other")
+#   HistogramSketch   -> fixed-edge histogram (+ under/overflow
+#                        + missing)
+#   DriftMonitor      -> one sketch per column + prediction
+#
+# Sketches never grow with traffic, update in O(batch),
+# and merge by adding counts, so per-worker monitors can
+# be combined. PSI compares a live monitor against the
+# reference built from train.csv by DataTransformation.
+# ======================================================
+
+import bisect
+import threading
+
+import numpy as np
+
+
+# Scores are 0-100; 20 bins of width 5
+SCORE_BIN_EDGES = np.linspace(0, 100, 21)
+
+# Live predictions are sketched under this name; the
+# reference holds the trained model's predictions on the
+# training set (see ModelTrainer.save_reference_predictions)
+PREDICTION_SKETCH_NAME = "prediction"
+
+# Batches up to this size are counted with plain Python;
+# numpy call overhead dominates for single requests
+SMALL_BATCH_ROWS = 16
+
+# Proportion floor so empty buckets don't blow up PSI
+PSI_EPSILON = 1e-4
+
+# Common rule of thumb: < 0.1 stable, 0.1-0.25 moderate, > 0.25 major
+PSI_WARNING = 0.1
+PSI_ALERT = 0.25
+
+
+# ======================================================
+# Categorical Sketch
+# ======================================================
+class CategoricalSketch:
+
+    def __init__(self, levels):
+        self.levels = list(levels)
+        self._index = {level: code for code, level in enumerate(self.levels)}
+
+        # Last bucket collects unseen levels and missing values
+        self.counts = np.zeros(len(self.levels) + 1, dtype=np.int64)
+
+
+    def update(self, values):
+        other = len(self.levels)
+        codes = [self._index.get(value, other) for value in values]
+
+        if len(codes) <= SMALL_BATCH_ROWS:
+            for code in codes:
+                self.counts[code] += 1
+        else:
+            self.counts += np.bincount(codes, minlength=self.counts.shape[0])
+
+
+    # Buckets compared by PSI (missing is part of "other")
+    @property
+    def bucket_counts(self):
+        return self.counts
+
+
+    def empty_like(self):
+        return CategoricalSketch(self.levels)
+
+
+    def merge(self, other):
+        if self.levels != other.levels:
+            raise ValueError("Cannot merge categorical sketches with different levels")
+        self.counts += other.counts
+        return self
+
+
+
+# ======================================================
+# Histogram Sketch
+# Buckets: [underflow, bin_1 .. bin_n, overflow]
+# The last bin is closed, so the top edge (100) is in range
+# ======================================================
+class HistogramSketch:
+
+    def __init__(self, edges=SCORE_BIN_EDGES):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(self.edges.shape[0] + 1, dtype=np.int64)
+        self.missing = 0
+
+        # Plain-list copy for the per-row bisect path
+        self._edge_list = self.edges.tolist()
+
+
+    def _update_small(self, values):
+        last_bin = len(self._edge_list) - 1
+        top = self._edge_list[-1]
+
+        for value in values:
+            # None counts as missing, as NaN does (and as in the
+            # numpy path, where None converts to NaN)
+            if value is None:
+                self.missing += 1
+                continue
+
+            value = float(value)
+            if value != value:
+                self.missing += 1
+            elif value == top:
+                self.counts[last_bin] += 1
+            else:
+                self.counts[bisect.bisect_right(self._edge_list, value)] += 1
+
+
+    def update(self, values):
+        if len(values) <= SMALL_BATCH_ROWS:
+            self._update_small(values)
+            return
+
+        values = np.asarray(values, dtype=np.float64).ravel()
+
+        is_missing = np.isnan(values)
+        if is_missing.any():
+            self.missing += int(is_missing.sum())
+            values = values[~is_missing]
+
+        buckets = np.searchsorted(self.edges, values, side="right")
+        buckets[values == self.edges[-1]] = self.edges.shape[0] - 1
+        self.counts += np.bincount(buckets, minlength=self.counts.shape[0])
+
+
+    # Buckets compared by PSI; missing values are a bucket of
+    # their own, since the preprocessor imputes them silently
+    @property
+    def bucket_counts(self):
+        return np.append(self.counts, self.missing)
+
+
+    def empty_like(self):
+        return HistogramSketch(self.edges)
+
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histogram sketches with different edges")
+        self.counts += other.counts
+        self.missing += other.missing
+        return self
+
+
+    # --------------------------------------------------
+    # Approximate quantile (linear within a bin; under/
+    # overflow are clamped to the outer edges)
+    # --------------------------------------------------
+    def quantile(self, q):
+        total = self.counts.sum()
+        if total == 0:
+            return float("nan")
+
+        cumulative = np.cumsum(self.counts)
+        bucket = int(np.searchsorted(cumulative, q * total, side="left"))
+
+        if bucket == 0:
+            return float(self.edges[0])
+        if bucket >= self.edges.shape[0]:
+            return float(self.edges[-1])
+
+        below = cumulative[bucket - 1]
+        fraction = (q * total - below) / self.counts[bucket]
+        low, high = self.edges[bucket - 1], self.edges[bucket]
+
+        return float(low + fraction * (high - low))
+
+
+
+# ======================================================
+# Function: population_stability_index
+# Purpose:
+#   PSI = sum((actual - expected) * ln(actual / expected))
+#   over bucket proportions
+# ======================================================
+def population_stability_index(expected_counts, actual_counts):
+
+    expected = np.asarray(expected_counts, dtype=np.float64)
+    actual = np.asarray(actual_counts, dtype=np.float64)
+
+    if expected.sum() == 0 or actual.sum() == 0:
+        return float("nan")
+
+    expected = np.clip(expected / expected.sum(), PSI_EPSILON, None)
+    actual = np.clip(actual / actual.sum(), PSI_EPSILON, None)
+
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+
+# ======================================================
+# Drift Monitor
+# ======================================================
+class DriftMonitor:
+
+    def __init__(self, sketches):
+        self.sketches = sketches
+        self.n_rows = 0
+        self._lock = threading.Lock()
+
+
+    # Locks don't pickle; monitors are shipped between
+    # worker processes and saved with save_object
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+    # --------------------------------------------------
+    # Reference monitor from a training DataFrame
+    # (prediction_column fills the prediction sketch)
+    # --------------------------------------------------
+    @classmethod
+    def from_frame(cls, df, categorical_columns, numerical_columns, prediction_column):
+
+        sketches = {
+            column: CategoricalSketch(sorted(df[column].dropna().unique().tolist()))
+            for column in categorical_columns
+        }
+        sketches.update({column: HistogramSketch() for column in numerical_columns})
+        sketches[PREDICTION_SKETCH_NAME] = HistogramSketch()
+
+        monitor = cls(sketches)
+        monitor.update(df, df[prediction_column].to_numpy())
+
+        return monitor
+
+
+    def empty_like(self):
+        return DriftMonitor(
+            {name: sketch.empty_like() for name, sketch in self.sketches.items()}
+        )
+
+
+    def update(self, features, predictions):
+
+        # One DataFrame → array conversion; per-column pandas
+        # access would dominate the cost of small requests
+        layout = tuple(features.columns)
+        rows = features.to_numpy(dtype=object)
+
+        values = {
+            name: rows[:, layout.index(name)]
+            for name in self.sketches if name != PREDICTION_SKETCH_NAME
+        }
+        values[PREDICTION_SKETCH_NAME] = predictions
+
+        with self._lock:
+            for name, sketch in self.sketches.items():
+                sketch.update(values[name])
+
+            self.n_rows += len(features)
+
+
+    def merge(self, other):
+
+        with self._lock:
+            for name, sketch in self.sketches.items():
+                sketch.merge(other.sketches[name])
+            self.n_rows += other.n_rows
+
+        return self
+
+
+    # --------------------------------------------------
+    # PSI per sketch against a reference monitor
+    # --------------------------------------------------
+    def drift_report(self, reference):
+
+        report = {}
+        for name, sketch in self.sketches.items():
+            psi = population_stability_index(
+                reference.sketches[name].bucket_counts,
+                sketch.bucket_counts
+            )
+
+            if np.isnan(psi):
+                status = "no data"
+            elif psi > PSI_ALERT:
+                status = "alert"
+            elif psi > PSI_WARNING:
+                status = "warning"
+            else:
+                status = "stable"
+
+            report[name] = {"psi": psi, "status": status}
+
+        return report
@@ -0,0 +1,356 @@
+# ======================================================
+# model_compiler.py
+# Compiles a fitted sklearn tree ensemble into flat
+# NumPy node arrays so a whole batch can be scored
+# against every tree at once (no per-tree Python calls)
+#
+# Scope: this speeds up request-sized batches only.
+# Large-batch throughput is NOT improved for forests and
+# gradient boosting: past a few hundred rows sklearn's
+# Cython traversal is faster (e.g. 20k rows, 256 trees:
+# RF 0.27s vs 0.88s, GB 0.023s vs 0.094s), so batch
+# scoring stays on sklearn. AdaBoost is the exception,
+# since its sklearn predict pays for a per-tree weighted
+# median. Each model is routed by its own calibrated
+# crossover (calibrate_crossover)
+# ======================================================
+
+import sys
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from sklearn.dummy import DummyRegressor
+from sklearn.ensemble import (
+    AdaBoostRegressor,
+    GradientBoostingRegressor,
+    RandomForestRegressor,
+)
+from sklearn.tree import DecisionTreeRegressor
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+# sklearn trees compare float32 features against float64 thresholds,
+# so inputs are cast the same way to reproduce identical routing
+TREE_INPUT_DTYPE = np.float32
+
+# Native index dtype, so np.take never has to convert the pointers
+NODE_INDEX_DTYPE = np.intp
+
+# (row, tree) pointers traversed per pass; small enough that the
+# working arrays stay cache resident
+POINTERS_PER_PASS = 65536
+
+# Batch sizes timed by calibrate_crossover(), up to the
+# 50k-row chunks the batch scoring CLI sends per call
+CALIBRATION_BATCH_SIZES = (1, 8, 32, 128, 512, 2048, 8192, 50_000)
+CALIBRATION_REPEATS = 5
+
+# Compiled path must be at least this much faster to be routed to
+CROSSOVER_MARGIN = 1.2
+
+
+# ======================================================
+# Compiled Model Container
+# Packed node arrays for all trees of the ensemble:
+#   feature   -> split feature per node (0 for leaves)
+#   threshold -> split threshold per node
+#   left      -> left child (leaves point to themselves)
+#   right     -> right child (leaves point to themselves)
+#   value     -> node output (only read at leaves)
+#   roots     -> offset of each tree's root node
+#
+# Note:
+#   Wins come from removing per-tree Python overhead;
+#   see the scope note at the top of this module
+# ======================================================
+@dataclass
+class CompiledTreeEnsemble:
+
+    kind: str
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    max_depth: int
+    n_features: int
+
+    # Ensemble-specific combination parameters
+    learning_rate: float = 1.0
+    init_value: float = 0.0
+    estimator_weights: np.ndarray = None
+
+    # Largest batch on which this predictor beat the original
+    # model when calibrated (0 → always use the original)
+    max_batch_rows: int = 0
+
+
+    # --------------------------------------------------
+    # Derived lookup tables used by the traversal
+    #   children[2 * node]     -> left child
+    #   children[2 * node + 1] -> right child
+    # --------------------------------------------------
+    def __post_init__(self):
+        self.children = np.column_stack([self.left, self.right]).ravel()
+
+
+    # --------------------------------------------------
+    # Route every row through every tree together
+    # Returns leaf values, shape (n_samples, n_trees)
+    # --------------------------------------------------
+    def leaf_values(self, X):
+
+        X = np.ascontiguousarray(X, dtype=TREE_INPUT_DTYPE)
+        n_rows, n_trees = X.shape[0], self.roots.shape[0]
+        flat_X = X.ravel()
+
+        # One node pointer per (row, tree), all starting at the roots
+        nodes = np.tile(self.roots, n_rows)
+        offsets = np.repeat(np.arange(n_rows, dtype=NODE_INDEX_DTYPE) * self.n_features, n_trees)
+
+        # Level-synchronous: every pointer moves one level per step.
+        # Leaves loop onto themselves, so max_depth steps land all
+        # pointers on their leaf with no per-step bookkeeping
+        for _ in range(self.max_depth):
+            x = flat_X.take(offsets + self.feature.take(nodes))
+
+            # sklearn routes X <= threshold to the left child
+            go_right = ~(x <= self.threshold.take(nodes))
+            nodes = self.children.take(2 * nodes + go_right)
+
+        return self.value.take(nodes).reshape(n_rows, n_trees)
+
+
+    # --------------------------------------------------
+    # Combine leaf values exactly as sklearn does
+    # (same operation order → identical floating point)
+    # --------------------------------------------------
+    def _combine(self, leaves):
+
+        if self.kind == "tree":
+            return leaves[:, 0]
+
+        if self.kind == "forest":
+            # sklearn adds tree outputs one by one, then divides;
+            # cumsum keeps that sequential summation order
+            return np.cumsum(leaves, axis=1)[:, -1] / leaves.shape[1]
+
+        if self.kind == "boosting":
+            # raw = init; raw += learning_rate * tree(X) per stage
+            stages = np.empty((leaves.shape[0], leaves.shape[1] + 1))
+            stages[:, 0] = self.init_value
+            stages[:, 1:] = self.learning_rate * leaves
+            return np.cumsum(stages, axis=1)[:, -1]
+
+        if self.kind == "adaboost":
+            # Weighted median of the estimators (AdaBoostRegressor._get_median_predict)
+            row_idx = np.arange(leaves.shape[0])
+            sorted_idx = np.argsort(leaves, axis=1)
+            weight_cdf = np.cumsum(self.estimator_weights[sorted_idx], axis=1, dtype=np.float64)
+            median_or_above = weight_cdf >= 0.5 * weight_cdf[:, -1][:, np.newaxis]
+            median_idx = median_or_above.argmax(axis=1)
+            median_estimators = sorted_idx[row_idx, median_idx]
+            return leaves[row_idx, median_estimators]
+
+        raise ValueError(f"Unknown compiled model kind: {self.kind}")
+
+
+    # --------------------------------------------------
+    # Drop-in replacement for model.predict(X)
+    # --------------------------------------------------
+    def predict(self, X, batch_size=None):
+
+        # Preprocessor output may be a sparse matrix
+        if hasattr(X, "toarray"):
+            X = X.toarray()
+
+        X = np.asarray(X, dtype=TREE_INPUT_DTYPE)
+
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(
+                f"X has shape {X.shape}, expected (n_samples, {self.n_features})"
+            )
+
+        if batch_size is None:
+            batch_size = max(1, POINTERS_PER_PASS // self.roots.shape[0])
+
+        predictions = np.empty(X.shape[0], dtype=np.float64)
+
+        for start in range(0, X.shape[0], batch_size):
+            stop = start + batch_size
+            predictions[start:stop] = self._combine(self.leaf_values(X[start:stop]))
+
+        return predictions
+
+
+
+# ======================================================
+# Function: _pack_trees
+# Purpose:
+#   Concatenate sklearn Tree objects into flat arrays,
+#   rewriting child indices to global node offsets
+# ======================================================
+def _pack_trees(trees):
+
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for tree in trees:
+        n_nodes = tree.node_count
+        node_ids = np.arange(offset, offset + n_nodes, dtype=NODE_INDEX_DTYPE)
+
+        left = tree.children_left.astype(NODE_INDEX_DTYPE)
+        right = tree.children_right.astype(NODE_INDEX_DTYPE)
+        is_leaf = left == -1
+
+        # Leaves become self-loops with a harmless split on feature 0
+        features.append(np.where(is_leaf, 0, tree.feature).astype(NODE_INDEX_DTYPE))
+        thresholds.append(np.where(is_leaf, 0.0, tree.threshold).astype(np.float64))
+        lefts.append(np.where(is_leaf, node_ids, left + offset))
+        rights.append(np.where(is_leaf, node_ids, right + offset))
+        values.append(tree.value[:, 0, 0].astype(np.float64))
+
+        roots.append(offset)
+        offset += n_nodes
+        max_depth = max(max_depth, tree.max_depth)
+
+    return (
+        np.concatenate(features),
+        np.concatenate(thresholds),
+        np.concatenate(lefts),
+        np.concatenate(rights),
+        np.concatenate(values),
+        np.array(roots, dtype=NODE_INDEX_DTYPE),
+        max_depth,
+    )
+
+
+
+# ======================================================
+# Function: compile_tree_ensemble
+# Purpose:
+#   Export a fitted tree model into CompiledTreeEnsemble
+#
+# Supported:
+#   DecisionTree, RandomForest, GradientBoosting, AdaBoost
+#   (any other model returns None → use model.predict)
+# ======================================================
+def compile_tree_ensemble(model):
+
+    try:
+        extra = {}
+
+        if isinstance(model, DecisionTreeRegressor):
+            kind = "tree"
+            estimators = [model]
+
+        elif isinstance(model, RandomForestRegressor):
+            kind = "forest"
+            estimators = list(model.estimators_)
+
+        elif isinstance(model, GradientBoostingRegressor):
+            kind = "boosting"
+            estimators = list(model.estimators_[:, 0])
+            extra["learning_rate"] = float(model.learning_rate)
+
+            # Constant initial prediction (DummyRegressor or 'zero')
+            if isinstance(model.init_, str) and model.init_ == "zero":
+                extra["init_value"] = 0.0
+            elif not isinstance(model.init_, DummyRegressor):
+                logging.info("GradientBoosting with a custom init estimator is not compilable")
+                return None
+            else:
+                probe = np.zeros((1, model.n_features_in_), dtype=TREE_INPUT_DTYPE)
+                extra["init_value"] = float(model._raw_predict_init(probe)[0, 0])
+
+        elif isinstance(model, AdaBoostRegressor):
+            kind = "adaboost"
+            estimators = list(model.estimators_)
+            extra["estimator_weights"] = np.asarray(
+                model.estimator_weights_[: len(estimators)], dtype=np.float64
+            )
+
+        else:
+            logging.info(f"{type(model).__name__} is not a compilable tree model")
+            return None
+
+        feature, threshold, left, right, value, roots, max_depth = _pack_trees(
+            [estimator.tree_ for estimator in estimators]
+        )
+
+        logging.info(
+            f"Compiled {type(model).__name__}: {len(roots)} trees, "
+            f"{feature.shape[0]} nodes, max depth {max_depth}"
+        )
+
+        return CompiledTreeEnsemble(
+            kind=kind,
+            feature=feature,
+            threshold=threshold,
+            left=left,
+            right=right,
+            value=value,
+            roots=roots,
+            max_depth=max_depth,
+            n_features=int(model.n_features_in_),
+            **extra,
+        )
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+
+# ======================================================
+# Function: calibrate_crossover
+# Purpose:
+#   Time model.predict vs compiled.predict on growing
+#   batch sizes and return the largest size at which the
+#   compiled form is faster by CROSSOVER_MARGIN (and so
+#   at every smaller size). 0 means never route to it.
+# ======================================================
+def calibrate_crossover(model, compiled, X_sample, batch_sizes=CALIBRATION_BATCH_SIZES):
+
+    try:
+        if hasattr(X_sample, "toarray"):
+            X_sample = X_sample.toarray()
+        X_sample = np.asarray(X_sample)
+
+        max_batch_rows = 0
+
+        for batch_size in batch_sizes:
+            X_batch = X_sample[np.arange(batch_size) % X_sample.shape[0]]
+
+            model_time = best_time(model.predict, X_batch)
+            compiled_time = best_time(compiled.predict, X_batch)
+
+            logging.info(
+                f"Crossover {batch_size} rows: model {model_time * 1000:.3f} ms, "
+                f"compiled {compiled_time * 1000:.3f} ms"
+            )
+
+            if compiled_time * CROSSOVER_MARGIN > model_time:
+                break
+            max_batch_rows = batch_size
+
+        return max_batch_rows
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def best_time(function, X, repeats=CALIBRATION_REPEATS):
+
+    # Best of several runs: least affected by scheduling noise
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(X)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
@@ -0,0 +1,236 @@
+# ======================================================
+# model_registry.py
+# Versioned, immutable artifact registry
+#
+# Layout:
+#   artifacts/registry/
+#     <content-hash>/        one immutable folder per run
+#       preprocessor.pkl
+#       model.pkl
+#       compiled_model.pkl   (tree models only)
+#       manifest.json
+#     CURRENT                name of the live version
+#
+# A run is copied into a staging folder, fsynced, renamed
+# to its content hash, and only then is CURRENT flipped
+# with an atomic rename, so readers always see a complete
+# version, also after a crash. A failed publish leaves no
+# staging folder behind.
+# ======================================================
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+# ======================================================
+# Config class
+# ======================================================
+@dataclass
+class ModelRegistryConfig:
+
+    registry_dir: str = os.path.join("artifacts", "registry")
+    pointer_file_name: str = "CURRENT"
+    manifest_file_name: str = "manifest.json"
+
+    # Hex digits of the sha256 used as version name
+    version_length: int = 16
+
+
+# ======================================================
+# Function: fsync_dir
+# Purpose:
+#   Make new entries / renames in a folder durable
+#   (POSIX; folders cannot be opened on Windows)
+# ======================================================
+def fsync_dir(dir_path):
+
+    if os.name == "nt":
+        return
+
+    fd = os.open(dir_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+
+# ======================================================
+# Model Registry
+# ======================================================
+class ModelRegistry:
+
+    def __init__(self, config=None):
+        self.registry_config = config or ModelRegistryConfig()
+
+
+    @property
+    def pointer_path(self):
+        return os.path.join(
+            self.registry_config.registry_dir,
+            self.registry_config.pointer_file_name
+        )
+
+
+    def version_dir(self, version):
+        return os.path.join(self.registry_config.registry_dir, version)
+
+
+    # --------------------------------------------------
+    # Name of the live version (None if nothing published)
+    # --------------------------------------------------
+    def current_version(self):
+
+        try:
+            with open(self.pointer_path) as file_obj:
+                return file_obj.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+
+    def list_versions(self):
+
+        if not os.path.isdir(self.registry_config.registry_dir):
+            return []
+
+        return sorted(
+            name for name in os.listdir(self.registry_config.registry_dir)
+            if os.path.isfile(
+                os.path.join(self.version_dir(name), self.registry_config.manifest_file_name)
+            )
+        )
+
+
+    # --------------------------------------------------
+    # Flip CURRENT to an existing version (atomic rename)
+    # --------------------------------------------------
+    def set_current(self, version):
+
+        try:
+            if not os.path.isdir(self.version_dir(version)):
+                raise FileNotFoundError(f"Unknown model version: {version}")
+
+            tmp_path = f"{self.pointer_path}.tmp-{os.getpid()}"
+            try:
+                with open(tmp_path, "w") as file_obj:
+                    file_obj.write(version)
+                    file_obj.flush()
+                    os.fsync(file_obj.fileno())
+
+                os.replace(tmp_path, self.pointer_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+            fsync_dir(self.registry_config.registry_dir)
+
+            logging.info(f"Registry CURRENT → {version}")
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+    # --------------------------------------------------
+    # Publish a training run
+    # Input:
+    #   artifact_paths → {file name in registry: source path}
+    #                    (missing sources are skipped)
+    # Output:
+    #   version name (content hash)
+    # --------------------------------------------------
+    def publish(self, artifact_paths, make_current=True):
+
+        try:
+            registry_dir = self.registry_config.registry_dir
+            os.makedirs(registry_dir, exist_ok=True)
+
+            # -------------------------------------------------
+            # Step 1: Copy artifacts into a private staging folder
+            # and hash them (file name + content, in name order)
+            # -------------------------------------------------
+            staging_dir = tempfile.mkdtemp(prefix=".staging-", dir=registry_dir)
+
+            try:
+                digest = hashlib.sha256()
+                files = []
+
+                for name in sorted(artifact_paths):
+                    source_path = artifact_paths[name]
+                    if source_path is None or not os.path.exists(source_path):
+                        continue
+
+                    staged_path = os.path.join(staging_dir, name)
+                    shutil.copyfile(source_path, staged_path)
+
+                    # Hash the staged copy: it is exactly what gets published
+                    digest.update(name.encode("utf-8"))
+                    with open(staged_path, "rb") as file_obj:
+                        for block in iter(lambda: file_obj.read(1 << 20), b""):
+                            digest.update(block)
+                        os.fsync(file_obj.fileno())
+
+                    files.append(name)
+
+                version = digest.hexdigest()[: self.registry_config.version_length]
+
+                with open(os.path.join(staging_dir, self.registry_config.manifest_file_name), "w") as file_obj:
+                    json.dump(
+                        {
+                            "version": version,
+                            "files": files,
+                            "created_at": datetime.now().isoformat(timespec="seconds"),
+                        },
+                        file_obj,
+                        indent=2
+                    )
+                    file_obj.flush()
+                    os.fsync(file_obj.fileno())
+
+                # mkdtemp folders are owner-only; serving processes may run as other users
+                os.chmod(staging_dir, 0o755)
+                fsync_dir(staging_dir)
+
+
+                # -------------------------------------------------
+                # Step 2: Move staging → <hash>. Identical content is
+                # already published, so the staging copy is dropped
+                # -------------------------------------------------
+                final_dir = self.version_dir(version)
+                try:
+                    os.rename(staging_dir, final_dir)
+                    staging_dir = None
+                    logging.info(f"Published model version {version}: {files}")
+                except OSError:
+                    if not os.path.isdir(final_dir):
+                        raise
+                    logging.info(f"Model version {version} already in registry")
+
+                fsync_dir(registry_dir)
+
+            finally:
+                # Any failure (or an already published version)
+                # leaves no staging folder behind
+                if staging_dir is not None:
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+            # -------------------------------------------------
+            # Step 3: Point CURRENT at the new version
+            # -------------------------------------------------
+            if make_current:
+                self.set_current(version)
+
+            return version
+
+        except Exception as e:
+            raise CustomException(e, sys)
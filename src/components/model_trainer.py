@@ -1,23 +1,32 @@
 import os
+import shutil
 import sys
 from dataclasses import dataclass
 
+import numpy as np
+
+import xgboost as xgb
 from catboost import CatBoostRegressor
 from sklearn.ensemble import (
     AdaBoostRegressor,
     GradientBoostingRegressor,
+    HistGradientBoostingRegressor,
     RandomForestRegressor,
 )
 
-from sklearn.linear_model import LinearRegression
+from sklearn.linear_model import LinearRegression, SGDRegressor
 from sklearn.metrics import r2_score
 from sklearn.neighbors import KNeighborsRegressor
 from sklearn.tree import DecisionTreeRegressor
 from xgboost import XGBRegressor
 
+from src.components.data_transformation import DataTransformation, DataTransformationConfig
+from src.components.drift_monitor import PREDICTION_SKETCH_NAME
+from src.components.model_compiler import calibrate_crossover, compile_tree_ensemble
+from src.components.model_registry import ModelRegistry
 from src.exception import CustomException
 from src.logger import logging
-from src.utils import save_object, evaluate_models
+from src.utils import load_object, save_object, save_artifact_manifest, evaluate_models, streaming_r2_score
 
 
 # ======================================================
@@ -26,6 +35,88 @@ from src.utils import save_object, evaluate_models
 @dataclass
 class ModelTrainerConfig:
     trained_model_file_path: str = os.path.join("artifacts", "model.pkl")
+    compiled_model_file_path: str = os.path.join("artifacts", "compiled_model.pkl")
+
+    # Written after every other artifact; serving reloads on it
+    artifact_manifest_file_path: str = os.path.join("artifacts", "artifacts_manifest.json")
+
+    # Out-of-core mode
+    sgd_epochs: int = 5
+    xgb_num_boost_round: int = 200
+    xgb_cache_prefix: str = os.path.join("artifacts", "xgb_cache", "train")
+    hist_sample_rows: int = 200_000
+
+
+# ======================================================
+# XGBoost external-memory iterator
+# Feeds transformed chunks to XGBoost, which pages them
+# through an on-disk cache instead of holding all rows
+# ======================================================
+class ChunkDataIter(xgb.DataIter):
+
+    def __init__(self, make_chunks, cache_prefix):
+        self._make_chunks = make_chunks
+        self._chunks = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        if self._chunks is None:
+            self._chunks = self._make_chunks()
+        try:
+            X, y = next(self._chunks)
+        except StopIteration:
+            return False
+        input_data(data=X, label=y)
+        return True
+
+    def reset(self):
+        self._chunks = None
+
+
+# ======================================================
+# Function: reservoir_sample
+# Purpose:
+#   Uniform fixed-size row sample from a chunk stream
+#   (vectorized Algorithm R)
+# ======================================================
+def reservoir_sample(chunks, size, random_state=42):
+
+    rng = np.random.default_rng(random_state)
+    X_sample = y_sample = None
+    seen = 0
+
+    for X, y in chunks:
+        if X_sample is None:
+            X_sample = np.empty((size, X.shape[1]))
+            y_sample = np.empty(size)
+
+        # Fill the reservoir first
+        n_fill = min(max(size - seen, 0), len(y))
+        X_sample[seen:seen + n_fill] = X[:n_fill]
+        y_sample[seen:seen + n_fill] = y[:n_fill]
+
+        # Row i (0-based, global) replaces a random slot with prob size / (i + 1)
+        positions = np.arange(seen + n_fill, seen + len(y))
+        slots = rng.integers(0, positions + 1)
+        rows = n_fill + np.flatnonzero(slots < size)
+        slots = slots[slots < size]
+
+        # A slot drawn twice in one chunk keeps the later row, as the
+        # row-by-row algorithm would; fancy assignment with repeated
+        # indices leaves the winner undefined
+        slots, last = np.unique(slots[::-1], return_index=True)
+        rows = rows[::-1][last]
+
+        X_sample[slots] = X[rows]
+        y_sample[slots] = y[rows]
+
+        seen += len(y)
+
+    if seen == 0:
+        raise ValueError("reservoir_sample got no rows to sample")
+
+    n_rows = min(seen, size)
+    return X_sample[:n_rows], y_sample[:n_rows]
 
 
 # ======================================================
@@ -36,7 +127,201 @@ class ModelTrainer:
     def __init__(self):
         self.model_trainer_config = ModelTrainerConfig()
 
-    def initiate_model_trainer(self, train_array, test_array):
+    # --------------------------------------------------
+    # Export step: compile tree ensembles into flat
+    # NumPy node arrays for the inference pipeline.
+    # Saved only if predictions match the original model
+    # exactly; otherwise any stale compiled file is removed
+    # --------------------------------------------------
+    def export_compiled_model(self, model, X_sample):
+
+        try:
+            compiled_path = self.model_trainer_config.compiled_model_file_path
+            compiled = compile_tree_ensemble(model)
+
+            if compiled is not None:
+                if not np.array_equal(model.predict(X_sample), compiled.predict(X_sample)):
+                    logging.warning("Compiled model predictions differ, skipping export")
+                    compiled = None
+                else:
+                    # Per-model batch size up to which the compiled
+                    # form is faster; the pipeline routes on it
+                    compiled.max_batch_rows = calibrate_crossover(model, compiled, X_sample)
+                    logging.info(
+                        f"Compiled model faster up to {compiled.max_batch_rows} rows"
+                    )
+
+            if compiled is None:
+                if os.path.exists(compiled_path):
+                    os.remove(compiled_path)
+                return None
+
+            save_object(file_path=compiled_path, obj=compiled)
+
+            return compiled_path
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    # --------------------------------------------------
+    # Drift reference for predictions: the best model's
+    # predictions on the training set. The target it
+    # replaces is wider than any regressor's output, so
+    # it would read as drift even on training traffic
+    # --------------------------------------------------
+    def save_reference_predictions(self, model, feature_chunks):
+
+        try:
+            reference_path = DataTransformationConfig().reference_sketch_file_path
+            reference = load_object(reference_path)
+
+            sketch = reference.sketches[PREDICTION_SKETCH_NAME].empty_like()
+            for X in feature_chunks:
+                sketch.update(model.predict(X))
+
+            reference.sketches[PREDICTION_SKETCH_NAME] = sketch
+            save_object(file_path=reference_path, obj=reference)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    # --------------------------------------------------
+    # Mark this run's artifacts complete (manifest, read by
+    # PredictPipeline's reload check), then publish them as
+    # a new immutable registry version and make it current
+    # --------------------------------------------------
+    def publish_artifacts(self, preprocessor_path=None):
+
+        try:
+            transformation_config = DataTransformationConfig()
+            if preprocessor_path is None:
+                preprocessor_path = transformation_config.preprocessor_obj_file_path
+
+            artifact_paths = {
+                "preprocessor.pkl": preprocessor_path,
+                "reference_sketch.pkl": transformation_config.reference_sketch_file_path,
+                "model.pkl": self.model_trainer_config.trained_model_file_path,
+                "compiled_model.pkl": self.model_trainer_config.compiled_model_file_path,
+            }
+
+            save_artifact_manifest(
+                self.model_trainer_config.artifact_manifest_file_path,
+                artifact_paths.values()
+            )
+
+            return ModelRegistry().publish(artifact_paths)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    # ==================================================
+    # Out-of-core training
+    # Flow:
+    #   streaming preprocessor fit (one pass)
+    #   → incremental / external-memory learners:
+    #       SGDRegressor          partial_fit per chunk, per epoch
+    #       XGBRegressor          DataIter + on-disk page cache
+    #       HistGradientBoosting  fit on a reservoir sample
+    #   → streaming test R2 → save / compile / publish best
+    # ==================================================
+    def initiate_out_of_core_model_trainer(self, train_path, test_path, chunk_rows=None):
+
+        try:
+            config = self.model_trainer_config
+            data_transformation = DataTransformation()
+            chunk_rows = chunk_rows or data_transformation.data_transformation_config.chunk_rows
+
+            preprocessing_obj, preprocessor_path = (
+                data_transformation.initiate_out_of_core_transformation(train_path, chunk_rows)
+            )
+
+            def train_chunks():
+                return DataTransformation.iter_transformed_chunks(
+                    train_path, preprocessing_obj, chunk_rows
+                )
+
+            def test_chunks():
+                return DataTransformation.iter_transformed_chunks(
+                    test_path, preprocessing_obj, chunk_rows
+                )
+
+            models = {}
+
+            # -------------------------------------------------
+            # SGDRegressor: several passes of partial_fit
+            # -------------------------------------------------
+            logging.info("Training SGDRegressor with partial_fit")
+            sgd = SGDRegressor(random_state=42)
+            for _ in range(config.sgd_epochs):
+                for X, y in train_chunks():
+                    sgd.partial_fit(X, y)
+            models["SGD Regressor"] = sgd
+
+            # -------------------------------------------------
+            # XGBoost: external-memory DMatrix over the chunks
+            # -------------------------------------------------
+            logging.info("Training XGBRegressor from external memory")
+            os.makedirs(os.path.dirname(config.xgb_cache_prefix), exist_ok=True)
+            dtrain = xgb.DMatrix(ChunkDataIter(train_chunks, config.xgb_cache_prefix))
+            booster = xgb.train(
+                {"tree_method": "hist", "objective": "reg:squarederror"},
+                dtrain,
+                num_boost_round=config.xgb_num_boost_round
+            )
+            xgb_model = XGBRegressor()
+            xgb_model.load_model(booster.save_raw(raw_format="ubj"))
+            models["XGBRegressor"] = xgb_model
+
+            # Page cache is only needed while training
+            del dtrain, booster
+            shutil.rmtree(os.path.dirname(config.xgb_cache_prefix), ignore_errors=True)
+
+            # -------------------------------------------------
+            # Histogram GBM: bins + trees from a bounded sample
+            # -------------------------------------------------
+            logging.info(f"Training HistGradientBoosting on a {config.hist_sample_rows}-row sample")
+            X_sample, y_sample = reservoir_sample(train_chunks(), config.hist_sample_rows)
+            models["HistGradientBoosting Regressor"] = HistGradientBoostingRegressor(
+                random_state=42
+            ).fit(X_sample, y_sample)
+
+            # -------------------------------------------------
+            # Evaluate on the test set, chunk by chunk
+            # -------------------------------------------------
+            model_report = {
+                model_name: streaming_r2_score(model, test_chunks())
+                for model_name, model in models.items()
+            }
+
+            for model_name, score in model_report.items():
+                logging.info(f"{model_name} -> Test R2: {score:.4f}")
+
+            best_model_name = max(model_report, key=model_report.get)
+            best_model_score = model_report[best_model_name]
+            best_model = models[best_model_name]
+
+            if best_model_score < 0.6:
+                raise CustomException("No best model found with acceptable performance", sys)
+
+            logging.info(f"Best model found: {best_model_name}")
+
+            save_object(
+                file_path=config.trained_model_file_path,
+                obj=best_model
+            )
+
+            self.save_reference_predictions(best_model, (X for X, _ in train_chunks()))
+
+            X_check, _ = next(test_chunks())
+            self.export_compiled_model(best_model, X_check)
+            self.publish_artifacts(preprocessor_path)
+
+            return best_model_score
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def initiate_model_trainer(self, train_array, test_array, preprocessor_path=None):
 
         try:
             logging.info("Splitting training and testing data")
@@ -134,6 +419,15 @@ class ModelTrainer:
                 obj=best_model
             )
 
+            # Drift reference from the model's own predictions
+            self.save_reference_predictions(best_model, [X_train])
+
+            # Export flat-array predictor (tree models only)
+            self.export_compiled_model(best_model, X_test)
+
+            # Publish versioned copy for serving processes
+            self.publish_artifacts(preprocessor_path)
+
             # Evaluate final model
             predicted = best_model.predict(X_test)
             r2_square = r2_score(y_test, predicted)
@@ -0,0 +1,472 @@
+# ======================================================
+# batch_predict.py
+# Parallel sharded batch scoring for large input files
+#
+# Flow:
+#   split input into shards (CSV byte ranges or Parquet
+#   row groups) → score each shard in a process pool
+#   (artifacts loaded once per worker, rows scored in
+#   chunks) → write per-shard outputs → merge in order
+#
+# Usage:
+#   python -m src.pipeline.batch_predict input.csv output.csv --workers 8
+#
+# Parquet input/output uses pyarrow (in requirements.txt)
+# ======================================================
+
+import argparse
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import pandas as pd
+
+from src.components.data_transformation import NUMERICAL_COLUMNS
+from src.exception import CustomException
+from src.logger import logging
+from src.pipeline.predict_pipeline import PredictPipeline, PredictPipelineConfig
+from src.utils import load_object
+
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+
+# ======================================================
+# Config class
+# ======================================================
+@dataclass
+class BatchPredictConfig:
+
+    # Worker processes (defaults to all cores)
+    workers: int = os.cpu_count() or 1
+
+    # Shards per worker; more shards → better load balancing
+    shards_per_worker: int = 4
+
+    # Rows held in memory per worker at a time
+    chunk_rows: int = 50_000
+
+    # Name of the appended prediction column
+    prediction_column: str = "predicted math score"
+
+    # Keep per-shard outputs after merging (debugging)
+    keep_parts: bool = False
+
+    # Merge per-shard drift sketches and report PSI
+    monitor_drift: bool = False
+
+
+def _is_parquet(path):
+    return path.lower().endswith(PARQUET_EXTENSIONS)
+
+
+# ======================================================
+# Sharding
+# ======================================================
+
+# --------------------------------------------------
+# CSV: split the body into byte ranges, each moved
+# forward to the next line start so no row is cut.
+# Assumes no quoted fields contain newlines.
+# --------------------------------------------------
+def plan_csv_shards(file_path, n_shards):
+
+    with open(file_path, "rb") as file_obj:
+        header = file_obj.readline()
+        body_start = file_obj.tell()
+        file_size = os.fstat(file_obj.fileno()).st_size
+
+        step = max(1, (file_size - body_start) // max(1, n_shards))
+        boundaries = [body_start]
+
+        for target in range(body_start + step, file_size, step):
+            if target <= boundaries[-1]:
+                continue
+            file_obj.seek(target - 1)
+            file_obj.readline()
+            if file_obj.tell() < file_size:
+                boundaries.append(file_obj.tell())
+
+        boundaries.append(file_size)
+
+    columns = next(csv.reader([header.decode("utf-8-sig")]))
+    ranges = [
+        (start, end) for start, end in zip(boundaries[:-1], boundaries[1:]) if end > start
+    ]
+
+    return columns, ranges
+
+
+# --------------------------------------------------
+# Parquet: row groups are already independent units,
+# assigned to shards as contiguous runs
+# --------------------------------------------------
+def plan_parquet_shards(file_path, n_shards):
+
+    import pyarrow.parquet as pq
+
+    n_groups = pq.ParquetFile(file_path).num_row_groups
+    n_shards = max(1, min(n_shards, n_groups))
+
+    return [
+        list(range(i * n_groups // n_shards, (i + 1) * n_groups // n_shards))
+        for i in range(n_shards)
+    ]
+
+
+# --------------------------------------------------
+# Parquet output schema, fixed once per run: every chunk
+# and every shard is cast to it, so per-chunk dtypes (a
+# score column is int64 in a clean chunk but float64 in
+# one with a missing value) cannot change the schema.
+# Parquet input keeps its schema with scores as float64;
+# CSV input is read as text, so its columns are strings.
+# --------------------------------------------------
+def output_parquet_schema(input_path, columns, prediction_column):
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if _is_parquet(input_path):
+        fields = [
+            pa.field(field.name, pa.float64()) if field.name in NUMERICAL_COLUMNS else field
+            for field in pq.read_schema(input_path)
+        ]
+    else:
+        fields = [pa.field(column, pa.string()) for column in columns]
+
+    return pa.schema(fields + [pa.field(prediction_column, pa.float64())])
+
+
+# --------------------------------------------------
+# File-like view over [start, end) of a binary file,
+# so pandas can stream one shard in chunks
+# --------------------------------------------------
+class _ByteRangeReader:
+
+    def __init__(self, file_obj, start, end):
+        self.file_obj = file_obj
+        self.file_obj.seek(start)
+        self.remaining = end - start
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file_obj.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    def readline(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        limit = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        line = self.file_obj.readline(limit)
+        self.remaining -= len(line)
+        return line
+
+
+
+# ======================================================
+# Worker side
+# CustomException cannot be unpickled in the parent (the
+# pool would report BrokenProcessPool and drop the cause),
+# so worker failures are re-raised as a plain RuntimeError
+# carrying the shard id and message; the parent wraps it.
+# ======================================================
+_worker_pipeline = None
+
+# Load failure in the initializer, reported by the first shard;
+# raising from the initializer itself would break the pool
+_worker_error = None
+
+
+def _init_worker(predict_config):
+
+    global _worker_pipeline, _worker_error
+
+    # One BLAS/OpenMP thread per process; parallelism comes from the pool
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(1)
+
+    try:
+        _worker_pipeline = PredictPipeline(predict_config).load_artifacts()
+    except Exception as e:
+        _worker_error = f"{type(e).__name__}: {e}"
+
+
+def _iter_shard_chunks(input_path, shard, columns, chunk_rows):
+
+    if _is_parquet(input_path):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(input_path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, row_groups=shard):
+            yield batch.to_pandas()
+        return
+
+    # Every column is read as text: per-chunk dtype inference would
+    # write 72 as 72.0 in chunks that happen to contain a missing
+    # score, and the output should repeat input values unchanged
+    start, end = shard
+    with open(input_path, "rb") as file_obj:
+        reader = _ByteRangeReader(file_obj, start, end)
+        yield from pd.read_csv(
+            reader, names=columns, header=None, chunksize=chunk_rows, dtype=str
+        )
+
+
+# Model input for a chunk: scores as float64 whatever the
+# chunk was read as (text for CSV, int/float for Parquet)
+def _model_features(chunk):
+    return chunk.astype({column: "float64" for column in NUMERICAL_COLUMNS})
+
+
+def _score_shard(task):
+
+    shard_id = task[0]
+
+    try:
+        return _score_shard_unsafe(task)
+    except Exception as e:
+        raise RuntimeError(f"Shard {shard_id} failed: {type(e).__name__}: {e}") from None
+
+
+def _score_shard_unsafe(task):
+
+    shard_id, input_path, shard, columns, part_path, batch_config, schema = task
+
+    if _worker_error is not None:
+        raise RuntimeError(f"Worker could not load artifacts: {_worker_error}")
+
+    start = time.perf_counter()
+    n_rows = 0
+    writer = None
+
+    try:
+        for chunk in _iter_shard_chunks(input_path, shard, columns, batch_config.chunk_rows):
+            chunk[batch_config.prediction_column] = _worker_pipeline.predict(_model_features(chunk))
+            n_rows += len(chunk)
+
+            if _is_parquet(part_path):
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(part_path, schema)
+                writer.write_table(table.select(schema.names).cast(schema))
+            else:
+                chunk.to_csv(part_path, mode="a", header=False, index=False)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    # Hand this shard's sketches back and start fresh for the next one
+    monitor = _worker_pipeline.reset_monitor()
+
+    return shard_id, part_path, n_rows, time.perf_counter() - start, monitor
+
+
+
+# ======================================================
+# Merge per-shard outputs (streamed, shard order kept)
+# ======================================================
+def _merge_parts(part_paths, output_path, columns, schema=None):
+
+    if _is_parquet(output_path):
+        import pyarrow.parquet as pq
+
+        # Created up front: an input with no rows still gets a file
+        with pq.ParquetWriter(output_path, schema) as writer:
+            for part_path in part_paths:
+                if not os.path.exists(part_path):
+                    continue
+                part_file = pq.ParquetFile(part_path)
+                for group in range(part_file.num_row_groups):
+                    writer.write_table(part_file.read_row_group(group).cast(schema))
+        return
+
+    with open(output_path, "w", newline="") as out_obj:
+        pd.DataFrame(columns=columns).to_csv(out_obj, index=False)
+
+    with open(output_path, "ab") as out_obj:
+        for part_path in part_paths:
+            if os.path.exists(part_path):
+                with open(part_path, "rb") as part_obj:
+                    shutil.copyfileobj(part_obj, out_obj)
+
+
+
+# ======================================================
+# Batch Prediction Pipeline
+# ======================================================
+class BatchPredictPipeline:
+
+    def __init__(self, config=None, predict_config=None):
+        self.batch_config = config or BatchPredictConfig()
+        self.predict_config = predict_config or PredictPipelineConfig(
+            monitor_drift=self.batch_config.monitor_drift
+        )
+
+
+    def run(self, input_path, output_path):
+
+        try:
+            start = time.perf_counter()
+            n_shards = self.batch_config.workers * self.batch_config.shards_per_worker
+
+            # -------------------------------------------------
+            # Step 1: Plan shards
+            # -------------------------------------------------
+            if _is_parquet(input_path):
+                import pyarrow.parquet as pq
+
+                columns = pq.ParquetFile(input_path).schema_arrow.names
+                shards = plan_parquet_shards(input_path, n_shards)
+            else:
+                columns, shards = plan_csv_shards(input_path, n_shards)
+
+            logging.info(
+                f"Scoring {input_path} in {len(shards)} shards "
+                f"with {self.batch_config.workers} workers"
+            )
+
+            # -------------------------------------------------
+            # Step 2: Score shards in parallel
+            # -------------------------------------------------
+            output_dir = os.path.dirname(os.path.abspath(output_path))
+            os.makedirs(output_dir, exist_ok=True)
+            parts_dir = tempfile.mkdtemp(prefix=".batch_predict_", dir=output_dir)
+            part_ext = os.path.splitext(output_path)[1] or ".csv"
+
+            schema = None
+            if _is_parquet(output_path):
+                schema = output_parquet_schema(
+                    input_path, columns, self.batch_config.prediction_column
+                )
+
+            try:
+                tasks = [
+                    (
+                        shard_id,
+                        input_path,
+                        shard,
+                        columns,
+                        os.path.join(parts_dir, f"part-{shard_id:05d}{part_ext}"),
+                        self.batch_config,
+                        schema,
+                    )
+                    for shard_id, shard in enumerate(shards)
+                ]
+
+                total_rows = 0
+                drift_monitor = None
+
+                with ProcessPoolExecutor(
+                    max_workers=self.batch_config.workers,
+                    initializer=_init_worker,
+                    initargs=(self.predict_config,),
+                ) as executor:
+                    for shard_id, _, n_rows, elapsed, monitor in executor.map(_score_shard, tasks):
+                        total_rows += n_rows
+                        logging.info(f"Shard {shard_id}: {n_rows} rows in {elapsed:.2f}s")
+
+                        if monitor is not None:
+                            drift_monitor = monitor if drift_monitor is None else drift_monitor.merge(monitor)
+
+                # -------------------------------------------------
+                # Step 3: Merge shard outputs
+                # -------------------------------------------------
+                _merge_parts(
+                    [task[4] for task in tasks],
+                    output_path,
+                    columns + [self.batch_config.prediction_column],
+                    schema,
+                )
+
+            # Shard outputs are removed on failure too,
+            # unless kept for debugging
+            finally:
+                if not self.batch_config.keep_parts:
+                    shutil.rmtree(parts_dir, ignore_errors=True)
+
+            elapsed = time.perf_counter() - start
+            rows_per_sec = total_rows / elapsed if elapsed > 0 else 0.0
+
+            logging.info(
+                f"Scored {total_rows} rows in {elapsed:.2f}s "
+                f"({rows_per_sec:,.0f} rows/sec) → {output_path}"
+            )
+
+            summary = {
+                "rows": total_rows,
+                "seconds": elapsed,
+                "rows_per_sec": rows_per_sec,
+                "output_path": output_path,
+            }
+
+            # -------------------------------------------------
+            # Step 4: Drift of this file vs. training data
+            # -------------------------------------------------
+            if drift_monitor is not None:
+                reference = load_object(self.predict_config.reference_sketch_file_path)
+                summary["drift"] = drift_monitor.drift_report(reference)
+
+                for name, result in summary["drift"].items():
+                    logging.info(f"Drift {name}: PSI={result['psi']:.4f} ({result['status']})")
+
+            return summary
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+
+# ======================================================
+# CLI Entry Point
+# ======================================================
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Batch-score a CSV or Parquet file")
+    parser.add_argument("input_path")
+    parser.add_argument("output_path")
+    parser.add_argument("--workers", type=int, default=BatchPredictConfig.workers)
+    parser.add_argument("--shards-per-worker", type=int, default=BatchPredictConfig.shards_per_worker)
+    parser.add_argument("--chunk-rows", type=int, default=BatchPredictConfig.chunk_rows)
+    parser.add_argument("--keep-parts", action="store_true")
+    parser.add_argument("--monitor-drift", action="store_true")
+    args = parser.parse_args()
+
+    summary = BatchPredictPipeline(
+        BatchPredictConfig(
+            workers=args.workers,
+            shards_per_worker=args.shards_per_worker,
+            chunk_rows=args.chunk_rows,
+            keep_parts=args.keep_parts,
+            monitor_drift=args.monitor_drift,
+        )
+    ).run(args.input_path, args.output_path)
+
+    print(
+        f"\nScored {summary['rows']} rows in {summary['seconds']:.2f}s "
+        f"({summary['rows_per_sec']:,.0f} rows/sec)"
+    )
+
+    for name, result in summary.get("drift", {}).items():
+        print(f"  {name:<30} PSI={result['psi']:.4f}  {result['status']}")
@@ -0,0 +1,170 @@
+# ======================================================
+# hot_reload.py
+# Zero-downtime model serving on top of ModelRegistry
+#
+# A background thread watches the registry's CURRENT
+# pointer. When it moves, the new version is loaded and
+# warmed off the request path, then swapped in with one
+# reference assignment. Requests always run against a
+# fully loaded pipeline and never wait on unpickling.
+# ======================================================
+
+import os
+import sys
+import threading
+from dataclasses import dataclass
+
+from src.components.model_registry import ModelRegistry
+from src.exception import CustomException
+from src.logger import logging
+from src.pipeline.predict_pipeline import PredictPipeline, PredictPipelineConfig
+
+
+# ======================================================
+# Config class
+# ======================================================
+@dataclass
+class HotReloadConfig:
+
+    # How often the CURRENT pointer is re-read
+    poll_interval_seconds: float = 2.0
+
+    # Sketch live traffic per version (needs reference_sketch.pkl)
+    monitor_drift: bool = False
+
+
+# ======================================================
+# Hot Reload Predictor
+# ======================================================
+class HotReloadPredictor:
+
+    def __init__(self, config=None, registry_config=None, cache_config=None):
+        self.reload_config = config or HotReloadConfig()
+        self.registry = ModelRegistry(registry_config)
+        self.cache_config = cache_config
+
+        # (version, PredictPipeline) — replaced as one reference
+        self._active = None
+
+        # Version that failed to load; not retried until CURRENT moves
+        self._failed_version = None
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+
+    @property
+    def version(self):
+        active = self._active
+        return None if active is None else active[0]
+
+
+    # --------------------------------------------------
+    # Load + warm one registry version (off request path)
+    # --------------------------------------------------
+    def _load_version(self, version):
+
+        version_dir = self.registry.version_dir(version)
+
+        pipeline = PredictPipeline(
+            config=PredictPipelineConfig(
+                model_file_path=os.path.join(version_dir, "model.pkl"),
+                compiled_model_file_path=os.path.join(version_dir, "compiled_model.pkl"),
+                preprocessor_file_path=os.path.join(version_dir, "preprocessor.pkl"),
+                reference_sketch_file_path=os.path.join(version_dir, "reference_sketch.pkl"),
+
+                # Versions are immutable; a new one arrives via CURRENT
+                artifact_manifest_file_path=None,
+                monitor_drift=self.reload_config.monitor_drift,
+            ),
+            cache_config=self.cache_config,
+        )
+
+        return pipeline.warm_up()
+
+
+    # --------------------------------------------------
+    # Swap in CURRENT if it moved; True when swapped
+    # --------------------------------------------------
+    def refresh(self):
+
+        version = self.registry.current_version()
+
+        if version is None or version == self.version or version == self._failed_version:
+            return False
+
+        try:
+            pipeline = self._load_version(version)
+        except Exception as e:
+            # Keep serving the previous version
+            self._failed_version = version
+            logging.error(f"Failed to load model version {version}: {e}")
+            return False
+
+        previous = self.version
+        self._active = (version, pipeline)
+        self._failed_version = None
+
+        logging.info(f"Serving model version {version} (was {previous})")
+
+        return True
+
+
+    def _watch(self):
+        while not self._stop_event.wait(self.reload_config.poll_interval_seconds):
+            self.refresh()
+
+
+    # --------------------------------------------------
+    # First load is synchronous: no requests are served
+    # before a model is ready
+    # --------------------------------------------------
+    def start(self):
+
+        try:
+            self.refresh()
+
+            if self._active is None:
+                raise RuntimeError(
+                    f"No loadable model version in {self.registry.registry_config.registry_dir}"
+                )
+
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._watch,
+                name="model-hot-reload",
+                daemon=True
+            )
+            self._thread.start()
+
+            return self
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+    def predict(self, features):
+
+        # One read of the reference: the whole request uses
+        # a single version even if a swap happens meanwhile
+        active = self._active
+        if active is None:
+            raise RuntimeError("HotReloadPredictor.start() has not been called")
+
+        return active[1].predict(features)
+
+
+    def drift_report(self):
+
+        active = self._active
+        if active is None:
+            raise RuntimeError("HotReloadPredictor.start() has not been called")
+
+        return active[1].drift_report()
@@ -0,0 +1,417 @@
+# ======================================================
+# predict_pipeline.py
+# Inference pipeline: raw feature DataFrame → predictions
+# ======================================================
+
+import os
+import sys
+import threading
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from src.components.data_transformation import CATEGORICAL_COLUMNS, NUMERICAL_COLUMNS
+from src.exception import CustomException
+from src.logger import logging
+from src.pipeline.prediction_cache import PredictionCache, make_keys
+from src.utils import artifact_manifest_matches, load_object
+
+
+# Rows per model call when precomputing the full prediction table
+PRECOMPUTE_BATCH_ROWS = 100_000
+
+
+# ======================================================
+# Config class
+# ======================================================
+@dataclass
+class PredictPipelineConfig:
+
+    model_file_path: str = os.path.join("artifacts", "model.pkl")
+    compiled_model_file_path: str = os.path.join("artifacts", "compiled_model.pkl")
+    preprocessor_file_path: str = os.path.join("artifacts", "preprocessor.pkl")
+
+    reference_sketch_file_path: str = os.path.join("artifacts", "reference_sketch.pkl")
+
+    # Written by ModelTrainer after all artifacts of a run; a
+    # cached pipeline reloads only when it changes (None → never)
+    artifact_manifest_file_path: str = os.path.join("artifacts", "artifacts_manifest.json")
+
+    # Sketch live inputs/predictions for drift reports
+    monitor_drift: bool = False
+
+
+# ======================================================
+# One loaded set of artifacts, with everything derived
+# from it (cache, drift reference + live sketches).
+# Replaced as one reference, so a request never mixes
+# artifacts, cached results or drift state of two loads
+# ======================================================
+@dataclass(frozen=True)
+class LoadedArtifacts:
+
+    preprocessor: object
+    model: object
+    compiled_model: object = None
+    cache: PredictionCache = None
+    reference_monitor: object = None
+    monitor: object = None
+
+
+
+# ======================================================
+# Prediction Pipeline
+# ======================================================
+class PredictPipeline:
+
+    def __init__(self, config=None, cache_config=None):
+        self.predict_config = config or PredictPipelineConfig()
+
+        # Optional memoization in front of the model
+        self.cache_config = cache_config
+
+        # LoadedArtifacts, loaded on first use
+        self._artifacts = None
+        self._reload_lock = threading.Lock()
+
+
+    def _loaded(self, name):
+        artifacts = self._artifacts
+        return None if artifacts is None else getattr(artifacts, name)
+
+    @property
+    def preprocessor(self):
+        return self._loaded("preprocessor")
+
+    @property
+    def model(self):
+        return self._loaded("model")
+
+    @property
+    def compiled_model(self):
+        return self._loaded("compiled_model")
+
+    @property
+    def cache(self):
+        return self._loaded("cache")
+
+    # Drift monitoring (reference from training, live from traffic)
+    @property
+    def reference_monitor(self):
+        return self._loaded("reference_monitor")
+
+    @property
+    def monitor(self):
+        return self._loaded("monitor")
+
+
+    # --------------------------------------------------
+    # Load preprocessor, model, (if exported) the compiled
+    # flat-array tree predictor, the drift reference of the
+    # same run, and a fresh cache + live monitor for them
+    # --------------------------------------------------
+    def _load(self):
+
+        cache = None
+        if self.cache_config is not None:
+            cache = PredictionCache(self.cache_config)
+
+            # Watch the manifest, not the individual files: training
+            # rewrites preprocessor.pkl long before model.pkl, and
+            # only a new manifest marks a complete set. Snapshot
+            # before loading, so a run finishing meanwhile is seen
+            manifest_path = self.predict_config.artifact_manifest_file_path
+            cache.watch([] if manifest_path is None else [manifest_path])
+
+        preprocessor = load_object(self.predict_config.preprocessor_file_path)
+        model = load_object(self.predict_config.model_file_path)
+        compiled_model = None
+
+        if os.path.exists(self.predict_config.compiled_model_file_path):
+            compiled_model = load_object(self.predict_config.compiled_model_file_path)
+            logging.info("Using compiled tree predictor")
+
+        reference_monitor = monitor = None
+        if self.predict_config.monitor_drift:
+            reference_monitor = load_object(self.predict_config.reference_sketch_file_path)
+            monitor = reference_monitor.empty_like()
+
+        artifacts = LoadedArtifacts(
+            preprocessor=preprocessor,
+            model=model,
+            compiled_model=compiled_model,
+            cache=cache,
+            reference_monitor=reference_monitor,
+            monitor=monitor,
+        )
+
+        if cache is not None and cache.cache_config.precompute:
+            self.precompute_cache(artifacts)
+
+        return artifacts
+
+
+    def load_artifacts(self):
+
+        try:
+            self._artifacts = self._load()
+
+            return self
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+    # --------------------------------------------------
+    # Reload after a new manifest, off the request path:
+    # requests keep using the previous artifacts until the
+    # new set (and its table) is fully built. The swap only
+    # happens if every file still matches the manifest after
+    # loading, i.e. the loaded set is one finished run.
+    # --------------------------------------------------
+    def _reload(self):
+
+        try:
+            manifest_path = self.predict_config.artifact_manifest_file_path
+            artifacts = self._load()
+
+            if artifact_manifest_matches(manifest_path):
+                self._artifacts = artifacts
+                logging.info("Model artifacts reloaded")
+            else:
+                # A newer run is being written; its manifest triggers the next reload
+                logging.warning("Artifacts do not match their manifest, reload skipped")
+
+        except Exception as e:
+            # Keep serving the previous artifacts
+            logging.error(f"Failed to reload model artifacts: {e}")
+        finally:
+            self._reload_lock.release()
+
+
+    def _start_reload(self):
+
+        # At most one reload in flight
+        if not self._reload_lock.acquire(blocking=False):
+            return
+
+        threading.Thread(target=self._reload, name="artifact-reload", daemon=True).start()
+
+
+    # --------------------------------------------------
+    # Deploy-time option: score every possible input row
+    # (encoder categories x score range) into a dense table
+    # --------------------------------------------------
+    def precompute_cache(self, artifacts=None):
+
+        try:
+            artifacts = artifacts or self._artifacts
+            preprocessor, cache = artifacts.preprocessor, artifacts.cache
+
+            cache_config = cache.cache_config
+            encoder = (
+                preprocessor.named_transformers_["cat_pipeline"]
+                .named_steps["one_hot_encoder"]
+            )
+            categories = [np.asarray(levels) for levels in encoder.categories_]
+            scores = np.arange(cache_config.min_score, cache_config.max_score + 1)
+
+            shape = tuple(len(levels) for levels in categories) + (len(scores),) * len(NUMERICAL_COLUMNS)
+            table = np.empty(shape, dtype=np.float64)
+            flat_table = table.reshape(-1)
+
+            logging.info(f"Precomputing {flat_table.size} predictions")
+
+            for start in range(0, flat_table.size, PRECOMPUTE_BATCH_ROWS):
+                stop = min(start + PRECOMPUTE_BATCH_ROWS, flat_table.size)
+                codes = np.unravel_index(np.arange(start, stop), shape)
+
+                frame = {
+                    column: categories[i][codes[i]]
+                    for i, column in enumerate(CATEGORICAL_COLUMNS)
+                }
+                frame.update({
+                    column: scores[codes[len(CATEGORICAL_COLUMNS) + i]]
+                    for i, column in enumerate(NUMERICAL_COLUMNS)
+                })
+
+                flat_table[start:stop] = self._predict_uncached(artifacts, pd.DataFrame(frame))
+
+            cache.set_table(categories, table)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+    # --------------------------------------------------
+    # Run one synthetic row through preprocessor + model
+    # so first real request pays no lazy-init cost
+    # --------------------------------------------------
+    def warm_up(self):
+
+        try:
+            if self._artifacts is None:
+                self.load_artifacts()
+
+            artifacts = self._artifacts
+            encoder = (
+                artifacts.preprocessor.named_transformers_["cat_pipeline"]
+                .named_steps["one_hot_encoder"]
+            )
+            sample = {
+                column: [levels[0]]
+                for column, levels in zip(CATEGORICAL_COLUMNS, encoder.categories_)
+            }
+            sample.update({column: [50] for column in NUMERICAL_COLUMNS})
+
+            self._predict_uncached(artifacts, pd.DataFrame(sample))
+
+            return self
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+    @staticmethod
+    def _predict_uncached(artifacts, features):
+
+        data_scaled = artifacts.preprocessor.transform(features)
+        compiled_model = artifacts.compiled_model
+
+        # Both paths return identical predictions; the compiled
+        # one is used up to the crossover measured at export
+        if compiled_model is not None and data_scaled.shape[0] <= compiled_model.max_batch_rows:
+            return compiled_model.predict(data_scaled)
+
+        return artifacts.model.predict(data_scaled)
+
+
+    # --------------------------------------------------
+    # PSI per input column and for predictions, comparing
+    # traffic seen since the artifacts were (re)loaded
+    # against the reference of the same training run
+    # --------------------------------------------------
+    def drift_report(self):
+
+        artifacts = self._artifacts
+        if artifacts is None or artifacts.monitor is None:
+            raise RuntimeError("Drift monitoring is disabled (monitor_drift=False)")
+
+        return artifacts.monitor.drift_report(artifacts.reference_monitor)
+
+
+    # --------------------------------------------------
+    # Hand back the live monitor and start a fresh one
+    # (batch workers report drift per shard)
+    # --------------------------------------------------
+    def reset_monitor(self):
+
+        artifacts = self._artifacts
+        if artifacts is None or artifacts.monitor is None:
+            return None
+
+        self._artifacts = replace(artifacts, monitor=artifacts.monitor.empty_like())
+        return artifacts.monitor
+
+
+    def predict(self, features):
+
+        try:
+            if self._artifacts is None:
+                self.load_artifacts()
+
+            # One read of the reference: the whole request uses a
+            # single set of artifacts even if a reload swaps meanwhile
+            artifacts = self._artifacts
+            predictions = self._predict(artifacts, features)
+
+            if artifacts.monitor is not None:
+                artifacts.monitor.update(features, predictions)
+
+            return predictions
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+    def _predict(self, artifacts, features):
+
+        cache = artifacts.cache
+
+        if cache is None:
+            return self._predict_uncached(artifacts, features)
+
+        # New artifacts on disk → rebuild in the background
+        if cache.check_artifacts():
+            self._start_reload()
+
+        # -------------------------------------------------
+        # Serve what we can from the cache, then score
+        # only the missing rows in one model call
+        # -------------------------------------------------
+        keys = make_keys(features)
+        predictions = np.empty(len(keys), dtype=np.float64)
+        missing = []
+
+        for position, key in enumerate(keys):
+            value = cache.get(key)
+            if value is None:
+                missing.append(position)
+            else:
+                predictions[position] = value
+
+        if missing:
+            scored = self._predict_uncached(artifacts, features.iloc[missing])
+            predictions[missing] = scored
+
+            for position, value in zip(missing, scored):
+                cache.put(keys[position], value)
+
+        return predictions
+
+
+
+# ======================================================
+# Custom Data
+# Maps raw user input to the DataFrame layout the
+# preprocessor was fitted on
+# ======================================================
+class CustomData:
+
+    def __init__(
+        self,
+        gender: str,
+        race_ethnicity: str,
+        parental_level_of_education: str,
+        lunch: str,
+        test_preparation_course: str,
+        reading_score: int,
+        writing_score: int
+    ):
+        self.gender = gender
+        self.race_ethnicity = race_ethnicity
+        self.parental_level_of_education = parental_level_of_education
+        self.lunch = lunch
+        self.test_preparation_course = test_preparation_course
+        self.reading_score = reading_score
+        self.writing_score = writing_score
+
+
+    def get_data_as_data_frame(self):
+
+        try:
+            custom_data_input_dict = {
+                "gender": [self.gender],
+                "race/ethnicity": [self.race_ethnicity],
+                "parental level of education": [self.parental_level_of_education],
+                "lunch": [self.lunch],
+                "test preparation course": [self.test_preparation_course],
+                "reading score": [self.reading_score],
+                "writing score": [self.writing_score],
+            }
+
+            return pd.DataFrame(custom_data_input_dict)
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,254 @@
+# ======================================================
+# prediction_cache.py
+# Memoized predictions keyed by the raw feature row
+#
+# The input space is small and finite (five categoricals
+# + two 0-100 integer scores) and production traffic
+# repeats rows heavily, so most requests can skip the
+# preprocessor and model entirely.
+#
+# Two layers:
+#   1. Bounded LRU dict with optional TTL
+#   2. Optional dense table of every possible input row,
+#      precomputed at deploy time
+# A cache belongs to one loaded set of artifacts; when the
+# watched artifact manifest changes, PredictPipeline builds
+# a new cache alongside the new artifacts and swaps both
+# in together.
+# ======================================================
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.components.data_transformation import CATEGORICAL_COLUMNS, NUMERICAL_COLUMNS
+from src.logger import logging
+
+
+# Key layout: categorical values first, then the scores
+FEATURE_COLUMNS = CATEGORICAL_COLUMNS + NUMERICAL_COLUMNS
+
+
+# ======================================================
+# Config class
+# ======================================================
+@dataclass
+class PredictionCacheConfig:
+
+    # Max rows kept in the LRU layer
+    max_size: int = 100_000
+
+    # Entry lifetime in seconds (None → never expires)
+    ttl_seconds: float = None
+
+    # How often artifact files are stat()ed for changes
+    check_interval_seconds: float = 1.0
+
+    # Build the full lookup table when artifacts load
+    precompute: bool = False
+
+    # Inclusive integer range of each score column
+    min_score: int = 0
+    max_score: int = 100
+
+
+# ======================================================
+# Function: normalize_value / make_keys
+# Purpose:
+#   Map a raw feature row to a hashable tuple. Keys hold
+#   exactly what the preprocessor receives: categoricals
+#   are used as-is (" male " is an unknown level, not
+#   "male"). Only numeric scores are normalized, because
+#   the numerical pipeline casts 72 and 72.0 (and None /
+#   NaN) to the same float anyway.
+# ======================================================
+def normalize_value(value):
+
+    if isinstance(value, (bool, np.bool_)):
+        return value
+
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+
+    if isinstance(value, (float, np.floating)):
+        if math.isnan(value):
+            return None
+        return int(value) if float(value).is_integer() else float(value)
+
+    return value
+
+
+def make_keys(features):
+
+    columns = [features[column].tolist() for column in CATEGORICAL_COLUMNS]
+    columns += [
+        [normalize_value(value) for value in features[column].tolist()]
+        for column in NUMERICAL_COLUMNS
+    ]
+
+    return list(zip(*columns))
+
+
+
+# ======================================================
+# Prediction Cache
+# ======================================================
+class PredictionCache:
+
+    def __init__(self, config=None):
+        self.cache_config = config or PredictionCacheConfig()
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # (category_index, table) precomputed at deploy time;
+        # swapped as one reference so readers never see half of it
+        self._lookup_table = None
+
+        # Artifact change detection
+        self._watched_paths = []
+        self._signature = None
+        self._next_check = 0.0
+
+        self.hits = 0
+        self.misses = 0
+
+
+    # --------------------------------------------------
+    # Artifact watching
+    # --------------------------------------------------
+    @staticmethod
+    def _file_signature(paths):
+
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append((path, None, None))
+
+        return tuple(signature)
+
+
+    def watch(self, paths):
+        self._watched_paths = list(paths)
+        self._signature = self._file_signature(self._watched_paths)
+        self._next_check = time.monotonic() + self.cache_config.check_interval_seconds
+
+
+    # Returns True once per change to the watched files
+    def check_artifacts(self):
+
+        now = time.monotonic()
+        if not self._watched_paths or now < self._next_check:
+            return False
+
+        self._next_check = now + self.cache_config.check_interval_seconds
+        signature = self._file_signature(self._watched_paths)
+
+        if signature == self._signature:
+            return False
+
+        self._signature = signature
+        logging.info("Model artifacts changed")
+
+        return True
+
+
+    # --------------------------------------------------
+    # Lookup / store
+    # --------------------------------------------------
+    def _table_lookup(self, key, lookup_table):
+
+        category_index, table = lookup_table
+
+        index = []
+        for position, value in enumerate(key):
+            if position < len(category_index):
+                code = category_index[position].get(value)
+            elif isinstance(value, int) and self.cache_config.min_score <= value <= self.cache_config.max_score:
+                code = value - self.cache_config.min_score
+            else:
+                code = None
+
+            if code is None:
+                return None
+            index.append(code)
+
+        return float(table[tuple(index)])
+
+
+    def get(self, key):
+
+        lookup_table = self._lookup_table
+        if lookup_table is not None:
+            value = self._table_lookup(key, lookup_table)
+            if value is not None:
+                self.hits += 1
+                return value
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            self.misses += 1
+            return None
+
+
+    def put(self, key, value):
+
+        ttl = self.cache_config.ttl_seconds
+        expires_at = None if ttl is None else time.monotonic() + ttl
+
+        with self._lock:
+            self._entries[key] = (float(value), expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.cache_config.max_size:
+                self._entries.popitem(last=False)
+
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._lookup_table = None
+
+
+    # --------------------------------------------------
+    # Precomputed full lookup table
+    #   categories -> one list of levels per categorical
+    #   table      -> predictions, shape
+    #                 (*category sizes, n_scores, n_scores)
+    # --------------------------------------------------
+    def set_table(self, categories, table):
+        category_index = [
+            {level: code for code, level in enumerate(np.asarray(levels).tolist())}
+            for levels in categories
+        ]
+        self._lookup_table = (category_index, table)
+        logging.info(f"Prediction table loaded with {table.size} entries")
+
+
+    def stats(self):
+        lookup_table = self._lookup_table
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+            "table_size": 0 if lookup_table is None else int(lookup_table[1].size),
+        }
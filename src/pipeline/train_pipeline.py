@@ -0,0 +1,84 @@
+# ======================================================
+# train_pipeline.py
+# End-to-end training entry point
+#
+# Usage:
+#   python -m src.pipeline.train_pipeline
+#   python -m src.pipeline.train_pipeline --out-of-core --chunk-rows 100000
+# ======================================================
+
+import argparse
+import sys
+
+from src.components.data_ingestion import DataIngestion
+from src.components.data_transformation import DataTransformation
+from src.components.model_trainer import ModelTrainer
+from src.exception import CustomException
+from src.logger import logging
+
+
+# ======================================================
+# Train Pipeline
+# ======================================================
+class TrainPipeline:
+
+    # --------------------------------------------------
+    # out_of_core=False → in-memory GridSearch over all models
+    # out_of_core=True  → chunked streaming fit with
+    #                     incremental / external-memory learners;
+    #                     ingestion streams the train/test split
+    #                     too, so the full dataset is never loaded
+    # --------------------------------------------------
+    def run(self, out_of_core=False, chunk_rows=None):
+
+        try:
+            logging.info("Training pipeline started")
+
+            # Step 1: Data Ingestion
+            if out_of_core:
+                train_path, test_path = (
+                    DataIngestion().initiate_streaming_data_ingestion(chunk_rows)
+                )
+            else:
+                train_path, test_path = DataIngestion().initiate_data_ingestion()
+
+            # Step 2 + 3: Transformation and Model Training
+            model_trainer = ModelTrainer()
+
+            if out_of_core:
+                r2_score_value = model_trainer.initiate_out_of_core_model_trainer(
+                    train_path, test_path, chunk_rows
+                )
+            else:
+                train_arr, test_arr, preprocessor_path = (
+                    DataTransformation().initiate_data_transformation(train_path, test_path)
+                )
+                r2_score_value = model_trainer.initiate_model_trainer(
+                    train_arr, test_arr, preprocessor_path
+                )
+
+            logging.info("Training pipeline completed")
+
+            return r2_score_value
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+
+# ======================================================
+# CLI Entry Point
+# ======================================================
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Train the student performance model")
+    parser.add_argument("--out-of-core", action="store_true")
+    parser.add_argument("--chunk-rows", type=int, default=None)
+    args = parser.parse_args()
+
+    r2_score_value = TrainPipeline().run(
+        out_of_core=args.out_of_core,
+        chunk_rows=args.chunk_rows
+    )
+
+    print(f"\nFinal R2 Score: {r2_score_value:.4f}")
@@ -3,6 +3,7 @@
 # Utility helper functions used across the project
 # ======================================================
 
+import json
 import os
 import sys
 import dill                          # used to serialize Python objects
@@ -38,10 +39,17 @@ def save_object(file_path, obj):
         # ----------------------------------------------
         # Serialize and save object using dill
         # dill is more flexible than pickle
+        #
+        # Written to a temp file in the same folder and
+        # renamed into place, so readers never see a
+        # half-written pickle
         # ----------------------------------------------
-        with open(file_path, "wb") as file_obj:
+        tmp_path = f"{file_path}.tmp-{os.getpid()}"
+        with open(tmp_path, "wb") as file_obj:
             dill.dump(obj, file_obj)
 
+        os.replace(tmp_path, file_path)
+
         logging.info("Object saved successfully")
 
     except Exception as e:
@@ -72,6 +80,54 @@ def load_object(file_path):
 
 
 
+# ======================================================
+# Function: save_artifact_manifest / artifact_manifest_matches
+# Purpose:
+#   Mark a complete, consistent set of artifacts. The
+#   manifest records (size, mtime) of every file and is
+#   written last, after all of them, so readers can tell
+#   a finished training run from one still in progress
+# ======================================================
+def _file_stat(file_path):
+
+    try:
+        stat = os.stat(file_path)
+        return [stat.st_size, stat.st_mtime_ns]
+    except FileNotFoundError:
+        return None
+
+
+def save_artifact_manifest(file_path, artifact_paths):
+
+    try:
+        manifest = {path: _file_stat(path) for path in artifact_paths}
+
+        tmp_path = f"{file_path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w") as file_obj:
+            json.dump(manifest, file_obj, indent=2)
+
+        os.replace(tmp_path, file_path)
+
+        logging.info(f"Artifact manifest written to {file_path}")
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+# True if every file listed in the manifest is unchanged
+# (files recorded as missing must still be missing)
+def artifact_manifest_matches(file_path):
+
+    try:
+        with open(file_path) as file_obj:
+            manifest = json.load(file_obj)
+    except (FileNotFoundError, ValueError):
+        return False
+
+    return all(_file_stat(path) == stat for path, stat in manifest.items())
+
+
+
 # ======================================================
 # Function: evaluate_models
 # Purpose:
@@ -139,3 +195,41 @@ def evaluate_models(X_train, y_train, X_test, y_test, models, params):
 
     except Exception as e:
         raise CustomException(e, sys)
+
+
+
+# ======================================================
+# Function: streaming_r2_score
+# Purpose:
+#   R2 of a fitted model over (X, y) chunks without
+#   holding the whole test set in memory
+# ======================================================
+def streaming_r2_score(model, chunks):
+
+    try:
+        n_rows = 0
+        sum_y = 0.0
+        sum_y_sq = 0.0
+        sum_sq_error = 0.0
+
+        for X, y in chunks:
+            y_pred = model.predict(X)
+
+            n_rows += len(y)
+            sum_y += float(y.sum())
+            sum_y_sq += float((y ** 2).sum())
+            sum_sq_error += float(((y - y_pred) ** 2).sum())
+
+        if n_rows == 0:
+            raise ValueError("streaming_r2_score got no rows to score")
+
+        total_sq = sum_y_sq - sum_y ** 2 / n_rows
+
+        # Constant target: same convention as sklearn's r2_score
+        if total_sq == 0:
+            return 1.0 if sum_sq_error == 0 else 0.0
+
+        return 1.0 - sum_sq_error / total_sq
+
+    except Exception as e:
+        raise CustomException(e, sys)
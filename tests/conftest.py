@@ -0,0 +1,101 @@
+# ======================================================
+# conftest.py
+# Shared fixtures: student data and a small set of saved
+# artifacts (preprocessor, model, reference sketch,
+# manifest) in a temporary folder
+# ======================================================
+
+import os
+
+import pandas as pd
+import pytest
+from sklearn.tree import DecisionTreeRegressor
+
+from src.components.data_transformation import (
+    CATEGORICAL_COLUMNS,
+    NUMERICAL_COLUMNS,
+    TARGET_COLUMN,
+    DataTransformation,
+)
+from src.components.drift_monitor import DriftMonitor
+from src.pipeline.predict_pipeline import PredictPipelineConfig
+from src.utils import save_artifact_manifest, save_object
+
+
+STUDENT_DATA_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "notebook", "data", "stud.csv"
+)
+
+
+# --------------------------------------------------
+# Timing tests only run with --run-benchmarks
+# --------------------------------------------------
+def pytest_addoption(parser):
+    parser.addoption("--run-benchmarks", action="store_true", help="run timing benchmarks")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: wall-clock timing check (opt-in)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks"):
+        return
+
+    skip = pytest.mark.skip(reason="needs --run-benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+
+@pytest.fixture(scope="session")
+def student_frame():
+    return pd.read_csv(STUDENT_DATA_PATH)
+
+
+# --------------------------------------------------
+# Fit + save one run's artifacts into a folder and
+# write its manifest last, as ModelTrainer does
+# --------------------------------------------------
+def write_artifacts(config, df, max_depth=6):
+
+    preprocessor = DataTransformation().get_data_transformer_object()
+    X = preprocessor.fit_transform(df.drop(columns=[TARGET_COLUMN]))
+    model = DecisionTreeRegressor(max_depth=max_depth, random_state=42).fit(X, df[TARGET_COLUMN])
+
+    reference = DriftMonitor.from_frame(df, CATEGORICAL_COLUMNS, NUMERICAL_COLUMNS, TARGET_COLUMN)
+
+    save_object(config.preprocessor_file_path, preprocessor)
+    save_object(config.model_file_path, model)
+    save_object(config.reference_sketch_file_path, reference)
+
+    save_artifact_manifest(
+        config.artifact_manifest_file_path,
+        [
+            config.preprocessor_file_path,
+            config.reference_sketch_file_path,
+            config.model_file_path,
+            config.compiled_model_file_path,
+        ]
+    )
+
+    return preprocessor, model
+
+
+def artifact_config(artifacts_dir, **kwargs):
+    return PredictPipelineConfig(
+        model_file_path=os.path.join(artifacts_dir, "model.pkl"),
+        compiled_model_file_path=os.path.join(artifacts_dir, "compiled_model.pkl"),
+        preprocessor_file_path=os.path.join(artifacts_dir, "preprocessor.pkl"),
+        reference_sketch_file_path=os.path.join(artifacts_dir, "reference_sketch.pkl"),
+        artifact_manifest_file_path=os.path.join(artifacts_dir, "artifacts_manifest.json"),
+        **kwargs
+    )
+
+
+@pytest.fixture
+def artifacts(tmp_path, student_frame):
+    config = artifact_config(str(tmp_path))
+    write_artifacts(config, student_frame)
+    return config
@@ -0,0 +1,68 @@
+# ======================================================
+# test_data_transformation.py
+# Out-of-core preprocessor vs. a full in-memory fit
+# ======================================================
+
+import numpy as np
+import pytest
+
+from src.components.data_transformation import (
+    CATEGORICAL_COLUMNS,
+    NUMERICAL_COLUMNS,
+    TARGET_COLUMN,
+    DataTransformation,
+)
+
+
+def _dense(X):
+    return X.toarray() if hasattr(X, "toarray") else np.asarray(X)
+
+
+@pytest.fixture
+def train_csv(tmp_path, student_frame):
+    df = student_frame.copy()
+    rng = np.random.default_rng(0)
+
+    # Missing values in every feature column, at different rates
+    for rate, column in zip(np.linspace(0.02, 0.2, 7), NUMERICAL_COLUMNS + CATEGORICAL_COLUMNS):
+        if column in NUMERICAL_COLUMNS:
+            df[column] = df[column].astype(float)
+        df.loc[rng.random(len(df)) < rate, column] = np.nan
+
+    path = tmp_path / "train.csv"
+    df.to_csv(path, index=False)
+    return str(path), df
+
+
+# --------------------------------------------------
+# Medians, modes and categories match fit(); scaler
+# moments are summed in another order, so outputs agree
+# to floating-point rounding rather than bit for bit
+# --------------------------------------------------
+@pytest.mark.parametrize("chunk_rows", [37, 100, 1000, 5000])
+def test_out_of_core_preprocessor_matches_full_fit(tmp_path, monkeypatch, train_csv, chunk_rows):
+    monkeypatch.chdir(tmp_path)
+    train_path, df = train_csv
+    features = df.drop(columns=[TARGET_COLUMN])
+
+    streamed, _ = DataTransformation().initiate_out_of_core_transformation(train_path, chunk_rows)
+    full = DataTransformation().get_data_transformer_object().fit(features)
+
+    for name in ("num_pipeline", "cat_pipeline"):
+        assert np.array_equal(
+            streamed.named_transformers_[name].named_steps["imputer"].statistics_,
+            full.named_transformers_[name].named_steps["imputer"].statistics_
+        )
+
+    for streamed_levels, full_levels in zip(
+        streamed.named_transformers_["cat_pipeline"].named_steps["one_hot_encoder"].categories_,
+        full.named_transformers_["cat_pipeline"].named_steps["one_hot_encoder"].categories_,
+    ):
+        assert streamed_levels.tolist() == full_levels.tolist()
+
+    assert np.allclose(
+        _dense(streamed.transform(features)),
+        _dense(full.transform(features)),
+        rtol=1e-12,
+        atol=1e-12
+    )
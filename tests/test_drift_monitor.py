@@ -0,0 +1,52 @@
+# ======================================================
+# test_drift_monitor.py
+# Sketch updates and PSI drift reports
+# ======================================================
+
+import numpy as np
+import pytest
+
+from src.components.data_transformation import CATEGORICAL_COLUMNS, NUMERICAL_COLUMNS, TARGET_COLUMN
+from src.components.drift_monitor import PREDICTION_SKETCH_NAME, DriftMonitor, HistogramSketch
+
+
+@pytest.fixture
+def reference(student_frame):
+    return DriftMonitor.from_frame(
+        student_frame, CATEGORICAL_COLUMNS, NUMERICAL_COLUMNS, TARGET_COLUMN
+    )
+
+
+@pytest.mark.parametrize("n_rows", [4, 400])
+def test_none_and_nan_count_as_missing(n_rows):
+    sketch = HistogramSketch()
+    sketch.update([None, float("nan"), 50, 100] * (n_rows // 4))
+
+    assert sketch.missing == n_rows // 2
+    assert sketch.counts.sum() == n_rows // 2
+
+
+def test_same_traffic_is_stable(reference, student_frame):
+    live = reference.empty_like()
+    live.update(student_frame, student_frame[TARGET_COLUMN].to_numpy())
+
+    report = live.drift_report(reference)
+    assert all(result["status"] == "stable" for result in report.values())
+
+
+# --------------------------------------------------
+# Missing scores are imputed silently by the preprocessor;
+# a surge of them must show up as drift
+# --------------------------------------------------
+def test_surge_of_missing_scores_is_reported(reference, student_frame):
+    traffic = student_frame.copy()
+    traffic["reading score"] = traffic["reading score"].astype(float)
+    traffic.loc[traffic.index[::2], "reading score"] = np.nan
+
+    live = reference.empty_like()
+    live.update(traffic, traffic[TARGET_COLUMN].to_numpy())
+
+    report = live.drift_report(reference)
+    assert report["reading score"]["status"] == "alert"
+    assert report["writing score"]["status"] == "stable"
+    assert report[PREDICTION_SKETCH_NAME]["status"] == "stable"
@@ -0,0 +1,148 @@
+# ======================================================
+# test_hot_reload.py
+# HotReloadPredictor: swaps on CURRENT, keeps serving
+# through failed loads and under concurrent requests
+# ======================================================
+
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from conftest import artifact_config, write_artifacts
+from src.components.data_transformation import TARGET_COLUMN
+from src.components.model_registry import ModelRegistry, ModelRegistryConfig
+from src.exception import CustomException
+from src.pipeline.hot_reload import HotReloadConfig, HotReloadPredictor
+
+
+@pytest.fixture
+def registry_config(tmp_path):
+    return ModelRegistryConfig(registry_dir=str(tmp_path / "registry"))
+
+
+@pytest.fixture
+def features(student_frame):
+    return student_frame.drop(columns=[TARGET_COLUMN]).head(50)
+
+
+def _publish_run(registry_config, run_dir, df, max_depth):
+    config = artifact_config(run_dir)
+    preprocessor, model = write_artifacts(config, df, max_depth=max_depth)
+
+    version = ModelRegistry(registry_config).publish({
+        "preprocessor.pkl": config.preprocessor_file_path,
+        "reference_sketch.pkl": config.reference_sketch_file_path,
+        "model.pkl": config.model_file_path,
+    })
+    return version, preprocessor, model
+
+
+@pytest.fixture
+def predictor(registry_config):
+    # Swaps are driven by refresh() in the tests, not by the poller
+    predictor = HotReloadPredictor(HotReloadConfig(poll_interval_seconds=3600), registry_config)
+    yield predictor
+    predictor.stop()
+
+
+def test_start_without_versions_fails(predictor):
+    with pytest.raises(CustomException, match="No loadable model version"):
+        predictor.start()
+
+
+def test_current_change_swaps_version(tmp_path, registry_config, predictor, student_frame, features):
+    first, _, _ = _publish_run(registry_config, str(tmp_path / "run1"), student_frame, 6)
+    predictor.start()
+    assert predictor.version == first
+    assert not predictor.refresh()
+
+    second, preprocessor, model = _publish_run(registry_config, str(tmp_path / "run2"), student_frame, 2)
+
+    assert predictor.refresh()
+    assert predictor.version == second
+    assert np.array_equal(predictor.predict(features), model.predict(preprocessor.transform(features)))
+
+
+# --------------------------------------------------
+# A version that fails to load is skipped (and not
+# retried) while the previous one keeps serving
+# --------------------------------------------------
+def test_failed_load_keeps_serving_previous_version(
+    tmp_path, registry_config, predictor, student_frame, features, monkeypatch
+):
+    first, preprocessor, model = _publish_run(registry_config, str(tmp_path / "run1"), student_frame, 6)
+    predictor.start()
+
+    broken_model = tmp_path / "broken.pkl"
+    broken_model.write_bytes(b"not a pickle")
+    broken = ModelRegistry(registry_config).publish({
+        "preprocessor.pkl": os.path.join(str(tmp_path / "run1"), "preprocessor.pkl"),
+        "model.pkl": str(broken_model),
+    })
+
+    loads = []
+    load_version = predictor._load_version
+    monkeypatch.setattr(predictor, "_load_version", lambda version: loads.append(version) or load_version(version))
+
+    assert not predictor.refresh()
+    assert not predictor.refresh()
+
+    assert loads == [broken]
+    assert predictor.version == first
+    assert np.array_equal(predictor.predict(features), model.predict(preprocessor.transform(features)))
+
+    # The next published version is picked up as usual
+    second, preprocessor, model = _publish_run(registry_config, str(tmp_path / "run2"), student_frame, 2)
+
+    assert predictor.refresh()
+    assert predictor.version == second
+
+
+# --------------------------------------------------
+# Requests running while CURRENT flips back and forth
+# never fail and always get one version's predictions
+# --------------------------------------------------
+def test_swaps_under_concurrent_requests(tmp_path, registry_config, predictor, student_frame, features):
+    runs = [
+        _publish_run(registry_config, str(tmp_path / f"run{depth}"), student_frame, depth)
+        for depth in (2, 6)
+    ]
+    expected = [model.predict(preprocessor.transform(features)) for _, preprocessor, model in runs]
+    predictor.start()
+
+    errors, results = [], []
+    stop = threading.Event()
+
+    def serve():
+        try:
+            while not stop.is_set():
+                results.append(predictor.predict(features))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=serve) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+
+    registry = ModelRegistry(registry_config)
+    versions = []
+    try:
+        for swap in range(10):
+            registry.set_current(runs[swap % 2][0])
+            predictor.refresh()
+            versions.append(predictor.version)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    assert versions == [runs[swap % 2][0] for swap in range(10)]
+
+    assert errors == []
+    assert results
+    assert all(
+        any(np.array_equal(result, predictions) for predictions in expected)
+        for result in results
+    )
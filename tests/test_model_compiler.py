@@ -0,0 +1,162 @@
+# ======================================================
+# test_model_compiler.py
+# Compiled tree predictor vs. the original sklearn model
+#
+# Run:
+#   python -m pytest tests
+# ======================================================
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import (
+    AdaBoostRegressor,
+    GradientBoostingRegressor,
+    RandomForestRegressor,
+)
+from sklearn.tree import DecisionTreeRegressor
+
+from src.components.data_transformation import DataTransformation, TARGET_COLUMN
+from src.components.model_compiler import (
+    CALIBRATION_BATCH_SIZES,
+    best_time,
+    calibrate_crossover,
+    compile_tree_ensemble,
+)
+
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "notebook", "data", "stud.csv")
+
+# 1 row (single request), a request-sized batch, a large batch
+BATCH_SIZES = (1, 64, 20_000)
+
+MODELS = {
+    "decision_tree": lambda: DecisionTreeRegressor(random_state=42),
+    "random_forest": lambda: RandomForestRegressor(n_estimators=64, random_state=42),
+    "gradient_boosting": lambda: GradientBoostingRegressor(n_estimators=128, random_state=42),
+    "gradient_boosting_zero_init": lambda: GradientBoostingRegressor(
+        n_estimators=128, init="zero", random_state=42
+    ),
+    "gradient_boosting_huber": lambda: GradientBoostingRegressor(
+        n_estimators=128, loss="huber", random_state=42
+    ),
+    "adaboost": lambda: AdaBoostRegressor(n_estimators=64, random_state=42),
+}
+
+
+@pytest.fixture(scope="module")
+def student_data():
+    df = pd.read_csv(DATA_PATH)
+
+    preprocessor = DataTransformation().get_data_transformer_object()
+    X = preprocessor.fit_transform(df.drop(columns=[TARGET_COLUMN]))
+    if hasattr(X, "toarray"):
+        X = X.toarray()
+
+    return X, df[TARGET_COLUMN].to_numpy()
+
+
+@pytest.fixture(scope="module", params=sorted(MODELS))
+def fitted(request, student_data):
+    X, y = student_data
+    model = MODELS[request.param]().fit(X, y)
+    compiled = compile_tree_ensemble(model)
+
+    assert compiled is not None
+    return model, compiled, X
+
+
+def _batch(X, n_rows):
+    return X[np.arange(n_rows) % X.shape[0]]
+
+
+@pytest.mark.parametrize("n_rows", BATCH_SIZES)
+def test_predictions_match_exactly(fitted, n_rows):
+    model, compiled, X = fitted
+    X_batch = _batch(X, n_rows)
+
+    assert np.array_equal(model.predict(X_batch), compiled.predict(X_batch))
+
+
+def test_unsupported_model_is_not_compiled(student_data):
+    from sklearn.linear_model import LinearRegression
+
+    X, y = student_data
+    assert compile_tree_ensemble(LinearRegression().fit(X, y)) is None
+
+
+# --------------------------------------------------
+# Routing: calibrate_crossover() with scripted timings
+# (compiled wins on the listed batch sizes only)
+# --------------------------------------------------
+def _script_timings(monkeypatch, compiled, compiled_wins):
+    def fake_best_time(function, X, repeats=None):
+        if function == compiled.predict:
+            return 0.5 if X.shape[0] in compiled_wins else 2.0
+        return 1.0
+
+    monkeypatch.setattr("src.components.model_compiler.best_time", fake_best_time)
+
+
+@pytest.mark.parametrize("n_wins", range(len(CALIBRATION_BATCH_SIZES) + 1))
+def test_crossover_is_last_size_of_winning_prefix(monkeypatch, fitted, n_wins):
+    model, compiled, X = fitted
+    _script_timings(monkeypatch, compiled, set(CALIBRATION_BATCH_SIZES[:n_wins]))
+
+    expected = CALIBRATION_BATCH_SIZES[n_wins - 1] if n_wins else 0
+    assert calibrate_crossover(model, compiled, X) == expected
+
+
+def test_crossover_stops_at_first_loss(monkeypatch, fitted):
+    model, compiled, X = fitted
+    losing = CALIBRATION_BATCH_SIZES[1]
+    _script_timings(monkeypatch, compiled, set(CALIBRATION_BATCH_SIZES) - {losing})
+
+    # A larger win never extends routing over a losing size
+    assert calibrate_crossover(model, compiled, X) == 1
+
+
+def test_crossover_is_a_calibrated_size(fitted):
+    model, compiled, X = fitted
+    max_batch_rows = calibrate_crossover(model, compiled, X[:200])
+
+    assert max_batch_rows in (0,) + CALIBRATION_BATCH_SIZES
+
+
+def test_pipeline_routes_on_max_batch_rows(fitted, monkeypatch):
+    from src.pipeline.predict_pipeline import LoadedArtifacts, PredictPipeline
+
+    model, compiled, X = fitted
+    monkeypatch.setattr(compiled, "max_batch_rows", 32)
+
+    class Identity:
+        def transform(self, features):
+            return features
+
+    calls = []
+    monkeypatch.setattr(compiled, "predict", lambda X: calls.append("compiled"))
+    artifacts = LoadedArtifacts(preprocessor=Identity(), model=model, compiled_model=compiled)
+
+    for n_rows in (1, 32, 33, 512):
+        calls.clear()
+        PredictPipeline._predict_uncached(artifacts, _batch(X, n_rows))
+        assert calls == (["compiled"] if n_rows <= 32 else [])
+
+
+# --------------------------------------------------
+# Benchmark: every size routed to the compiled path is
+# actually faster on this machine
+#   python -m pytest tests --run-benchmarks
+# --------------------------------------------------
+@pytest.mark.benchmark
+def test_routed_batches_are_faster(fitted):
+    model, compiled, X = fitted
+    max_batch_rows = calibrate_crossover(model, compiled, X)
+
+    for n_rows in CALIBRATION_BATCH_SIZES:
+        if n_rows > max_batch_rows:
+            break
+        X_batch = _batch(X, n_rows)
+        assert best_time(compiled.predict, X_batch) < best_time(model.predict, X_batch)
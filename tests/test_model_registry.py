@@ -0,0 +1,97 @@
+# ======================================================
+# test_model_registry.py
+# Publishing versions and flipping CURRENT
+# ======================================================
+
+import os
+
+import pytest
+
+from src.components.model_registry import ModelRegistry, ModelRegistryConfig
+from src.exception import CustomException
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(ModelRegistryConfig(registry_dir=str(tmp_path / "registry")))
+
+
+@pytest.fixture
+def run_files(tmp_path):
+    paths = {}
+    for name, content in [("preprocessor.pkl", b"preprocessor"), ("model.pkl", b"model")]:
+        path = tmp_path / name
+        path.write_bytes(content)
+        paths[name] = str(path)
+    return paths
+
+
+def _registry_entries(registry):
+    return sorted(os.listdir(registry.registry_config.registry_dir))
+
+
+def test_publishing_same_run_twice_is_one_version(registry, run_files):
+    version = registry.publish(run_files)
+
+    assert registry.publish(dict(run_files, **{"compiled_model.pkl": None})) == version
+    assert registry.list_versions() == [version]
+    assert registry.current_version() == version
+
+    # No staging folders or pointer temp files left behind
+    assert _registry_entries(registry) == sorted(["CURRENT", version])
+
+
+def test_new_content_is_a_new_version(registry, run_files):
+    first = registry.publish(run_files)
+
+    with open(run_files["model.pkl"], "wb") as file_obj:
+        file_obj.write(b"retrained model")
+    second = registry.publish(run_files, make_current=False)
+
+    assert first != second
+    assert registry.current_version() == first
+    assert sorted(os.listdir(registry.version_dir(second))) == ["manifest.json", "model.pkl", "preprocessor.pkl"]
+
+
+def test_set_current_is_idempotent(registry, run_files):
+    first = registry.publish(run_files)
+    with open(run_files["model.pkl"], "wb") as file_obj:
+        file_obj.write(b"retrained model")
+    second = registry.publish(run_files)
+
+    for _ in range(2):
+        registry.set_current(first)
+        assert registry.current_version() == first
+
+    assert _registry_entries(registry) == sorted(["CURRENT", first, second])
+
+
+def test_set_current_rejects_unknown_version(registry, run_files):
+    version = registry.publish(run_files)
+
+    with pytest.raises(CustomException):
+        registry.set_current("0" * 16)
+
+    assert registry.current_version() == version
+
+
+# --------------------------------------------------
+# A publish that fails after staging started removes
+# the staging folder and leaves CURRENT alone
+# --------------------------------------------------
+@pytest.mark.parametrize("failing_call", ["shutil.copyfile", "os.rename", "json.dump"])
+def test_failed_publish_leaves_no_staging_folder(registry, run_files, monkeypatch, failing_call):
+    version = registry.publish(run_files)
+    with open(run_files["model.pkl"], "wb") as file_obj:
+        file_obj.write(b"retrained model")
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(f"src.components.model_registry.{failing_call}", fail)
+
+    with pytest.raises(CustomException):
+        registry.publish(run_files)
+
+    assert _registry_entries(registry) == sorted(["CURRENT", version])
+    assert registry.current_version() == version
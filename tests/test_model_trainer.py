@@ -0,0 +1,95 @@
+# ======================================================
+# test_model_trainer.py
+# Trainer helpers: drift reference predictions
+# ======================================================
+
+import os
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from src.components.data_transformation import (
+    CATEGORICAL_COLUMNS,
+    NUMERICAL_COLUMNS,
+    TARGET_COLUMN,
+    DataTransformation,
+    DataTransformationConfig,
+)
+from src.components.drift_monitor import PREDICTION_SKETCH_NAME, DriftMonitor
+from src.components.model_trainer import ModelTrainer, reservoir_sample
+from src.utils import load_object, save_object
+
+
+# --------------------------------------------------
+# Scoring the training data itself must not read as
+# prediction drift (it did while the target was used)
+# --------------------------------------------------
+def test_reference_prediction_sketch_comes_from_model(tmp_path, monkeypatch, student_frame):
+    monkeypatch.chdir(tmp_path)
+    reference_path = DataTransformationConfig().reference_sketch_file_path
+    os.makedirs(os.path.dirname(reference_path))
+
+    save_object(
+        reference_path,
+        DriftMonitor.from_frame(student_frame, CATEGORICAL_COLUMNS, NUMERICAL_COLUMNS, TARGET_COLUMN)
+    )
+
+    X = DataTransformation().get_data_transformer_object().fit_transform(
+        student_frame.drop(columns=[TARGET_COLUMN])
+    )
+    model = RandomForestRegressor(n_estimators=16, random_state=42).fit(X, student_frame[TARGET_COLUMN])
+
+    ModelTrainer().save_reference_predictions(model, [X[:500], X[500:]])
+    reference = load_object(reference_path)
+
+    live = reference.empty_like()
+    live.update(student_frame, model.predict(X))
+
+    assert live.drift_report(reference)[PREDICTION_SKETCH_NAME]["psi"] == 0.0
+    assert reference.sketches[PREDICTION_SKETCH_NAME].counts.sum() == len(student_frame)
+
+
+# --------------------------------------------------
+# Reservoir sampling: same sample as Algorithm R applied
+# row by row to the same random draws
+# --------------------------------------------------
+def _row_by_row_sample(chunks, size, random_state=42):
+    rng = np.random.default_rng(random_state)
+    sample, seen, repeated_slots = [], 0, 0
+
+    for X, y in chunks:
+        n_fill = min(max(size - seen, 0), len(y))
+        sample.extend(zip(X[:n_fill], y[:n_fill]))
+
+        slots = rng.integers(0, np.arange(seen + n_fill, seen + len(y)) + 1)
+        hits = slots[slots < size]
+        repeated_slots += len(hits) - len(np.unique(hits))
+        for row, slot in enumerate(slots, start=n_fill):
+            if slot < size:
+                sample[slot] = (X[row], y[row])
+
+        seen += len(y)
+
+    return np.array([x for x, _ in sample]), np.array([y for _, y in sample]), repeated_slots
+
+
+@pytest.mark.parametrize("size, chunk_rows", [(3, 500), (10, 7), (50, 1000), (2000, 300)])
+def test_reservoir_sample_matches_row_by_row(size, chunk_rows):
+    X = np.arange(1000 * 2, dtype=np.float64).reshape(1000, 2)
+    y = np.arange(1000, dtype=np.float64)
+    chunks = [(X[i:i + chunk_rows], y[i:i + chunk_rows]) for i in range(0, len(y), chunk_rows)]
+
+    X_sample, y_sample = reservoir_sample(chunks, size)
+    X_expected, y_expected, repeated_slots = _row_by_row_sample(chunks, size)
+
+    # Small reservoirs + large chunks draw the same slot many times
+    if size < chunk_rows:
+        assert repeated_slots > 0
+    assert np.array_equal(X_sample, X_expected)
+    assert np.array_equal(y_sample, y_expected)
+
+
+def test_reservoir_sample_rejects_empty_stream():
+    with pytest.raises(ValueError, match="no rows"):
+        reservoir_sample(iter([]), size=10)
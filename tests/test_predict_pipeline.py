@@ -0,0 +1,116 @@
+# ======================================================
+# test_predict_pipeline.py
+# Cached PredictPipeline: reload only on a complete,
+# consistent set of artifacts
+# ======================================================
+
+import time
+
+import numpy as np
+import pytest
+
+from conftest import write_artifacts
+from src.components.data_transformation import TARGET_COLUMN, DataTransformation
+from src.pipeline.predict_pipeline import PredictPipeline
+from src.pipeline.prediction_cache import PredictionCacheConfig
+from src.utils import save_object
+
+
+def _cached_pipeline(config):
+    return PredictPipeline(
+        config,
+        cache_config=PredictionCacheConfig(check_interval_seconds=0.0)
+    ).load_artifacts()
+
+
+def _wait_for_reload(pipeline, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while pipeline._reload_lock.locked():
+        if time.monotonic() > deadline:
+            pytest.fail("Reload did not finish")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def features(student_frame):
+    return student_frame.drop(columns=[TARGET_COLUMN]).head(20)
+
+
+# --------------------------------------------------
+# Training writes preprocessor.pkl long before model.pkl;
+# a new preprocessor alone must never be paired with the
+# old model
+# --------------------------------------------------
+def test_rewriting_only_preprocessor_does_not_swap(artifacts, student_frame, features):
+    pipeline = _cached_pipeline(artifacts)
+    loaded = pipeline._artifacts
+    before = pipeline.predict(features)
+
+    preprocessor = DataTransformation().get_data_transformer_object()
+    preprocessor.fit(student_frame.drop(columns=[TARGET_COLUMN]).head(100))
+    save_object(artifacts.preprocessor_file_path, preprocessor)
+
+    for _ in range(5):
+        time.sleep(0.01)
+        assert np.array_equal(pipeline.predict(features), before)
+        _wait_for_reload(pipeline)
+
+    assert pipeline._artifacts is loaded
+
+
+def test_new_manifest_swaps_in_new_artifacts(artifacts, student_frame, features):
+    pipeline = _cached_pipeline(artifacts)
+    loaded = pipeline._artifacts
+
+    preprocessor, model = write_artifacts(artifacts, student_frame, max_depth=2)
+
+    pipeline.predict(features)
+    _wait_for_reload(pipeline)
+
+    assert pipeline._artifacts is not loaded
+    assert np.array_equal(
+        pipeline.predict(features),
+        model.predict(preprocessor.transform(features))
+    )
+
+
+# --------------------------------------------------
+# Manifest present but a file changed after it (next run
+# already writing): the mixed set is not swapped in
+# --------------------------------------------------
+def test_files_changed_after_manifest_are_not_swapped_in(artifacts, student_frame, features):
+    pipeline = _cached_pipeline(artifacts)
+    loaded = pipeline._artifacts
+
+    write_artifacts(artifacts, student_frame, max_depth=2)
+    preprocessor = DataTransformation().get_data_transformer_object()
+    preprocessor.fit(student_frame.drop(columns=[TARGET_COLUMN]).head(100))
+    save_object(artifacts.preprocessor_file_path, preprocessor)
+
+    pipeline.predict(features)
+    _wait_for_reload(pipeline)
+
+    assert pipeline._artifacts is loaded
+
+
+# --------------------------------------------------
+# Drift after a reload compares the new model's traffic
+# with the new run's reference, not the old one
+# --------------------------------------------------
+def test_reload_replaces_drift_reference_and_live_monitor(artifacts, student_frame, features):
+    artifacts.monitor_drift = True
+    pipeline = _cached_pipeline(artifacts)
+    pipeline.predict(features)
+
+    old_reference, old_monitor = pipeline.reference_monitor, pipeline.monitor
+    assert old_monitor.n_rows == len(features)
+
+    write_artifacts(artifacts, student_frame.head(300), max_depth=2)
+    pipeline.predict(features)
+    _wait_for_reload(pipeline)
+    pipeline.predict(features.head(5))
+
+    assert pipeline.reference_monitor is not old_reference
+    assert pipeline.reference_monitor.n_rows == 300
+    assert pipeline.monitor.n_rows == 5
+    assert set(pipeline.drift_report()) == set(old_reference.sketches)